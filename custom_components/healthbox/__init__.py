@@ -3,25 +3,33 @@ from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY, CONF_HOST
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
 from pyhealthbox3.healthbox3 import Healthbox3
 
 from .const import (
-    ALL_SERVICES,
+    CONF_FAST_START,
+    DATA_DEVICE_RESOLVER,
     DOMAIN,
-    SERVICE_CHANGE_ROOM_PROFILE,
-    SERVICE_CHANGE_ROOM_PROFILE_SCHEMA,
-    SERVICE_START_ROOM_BOOST,
-    SERVICE_START_ROOM_BOOST_SCHEMA,
-    SERVICE_STOP_ROOM_BOOST,
-    SERVICE_STOP_ROOM_BOOST_SCHEMA,
     PLATFORMS,
+    STORAGE_VERSION,
 )
 
 from .coordinator import HealthboxDataUpdateCoordinator
+from .scheduler import async_get_fleet_scheduler
+from .services import async_setup_services
+from .session import async_get_session_pool
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Renson Healthbox services."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -34,74 +42,41 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # if CONF_API_KEY in entry.options:
     #     api_key = entry.options[CONF_API_KEY]
 
-    api: Healthbox3 = Healthbox3(
-        host=entry.data[CONF_HOST],
-        api_key=api_key,
-        session=async_get_clientsession(hass),
-    )
-    if api_key:
-        await api.async_enable_advanced_api_features()
-
+    host: str = entry.data[CONF_HOST]
+    session_pool = async_get_session_pool(hass)
+    session = session_pool.async_acquire(host)
+    api: Healthbox3 = Healthbox3(host=host, api_key=api_key, session=session)
+    entry.async_on_unload(lambda: session_pool.async_release(host))
+    scheduler = async_get_fleet_scheduler(hass)
+    scheduler.async_add(entry.entry_id)
+    entry.async_on_unload(lambda: scheduler.async_remove(entry.entry_id))
     coordinator = HealthboxDataUpdateCoordinator(
-        hass=hass, entry=entry, api=api)
-    await coordinator.async_config_entry_first_refresh()
+        hass=hass, entry=entry, api=api, scheduler=scheduler, session=session)
+
+    # Reloads and entries set up at runtime always start from the stored topology.
+    fast_start = (
+        entry.options.get(CONF_FAST_START, False) or hass.state is CoreState.running
+    )
+    # Always restore: the stored snapshot carries totals such as the fan energy.
+    restored = await coordinator.async_restore()
+    if fast_start and restored:
+        # Set up the entities from the restored data and go live in the background.
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_start(enable_advanced_api=bool(api_key)),
+            f"{DOMAIN} start {entry.entry_id}",
+        )
+    else:
+        if api_key:
+            await api.async_enable_advanced_api_features()
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    coordinator.async_activate_projection()
+
+    hass.data[DATA_DEVICE_RESOLVER].async_add_entry(entry)
 
-    # Define Services
-
-    async def change_room_profile(call: ServiceCall) -> None:
-        """Service to change the HB3 Room Profile."""
-        device_id = call.data["device_id"]
-        device_registry = dr.async_get(hass)
-        device = device_registry.async_get(device_id)
-        if device:
-            device_identifier = next(iter(device.identifiers))[1]
-            room_id: int = int(device_identifier.split("_")[-1])
-            await coordinator.change_room_profile(
-                room_id=room_id,
-                profile_name=call.data["profile_name"]
-            )
-
-    async def start_room_boost(call: ServiceCall) -> None:
-        """Service call to start boosting fans in a room."""
-        device_id = call.data["device_id"]
-        device_registry = dr.async_get(hass)
-        device = device_registry.async_get(device_id)
-
-        if device:
-            device_identifier = next(iter(device.identifiers))[1]
-            room_id: int = int(device_identifier.split("_")[-1])
-            await coordinator.start_room_boost(
-                room_id=room_id,
-                boost_level=call.data["boost_level"],
-                boost_timeout=call.data["boost_timeout"] * 60,
-            )
-
-    async def stop_room_boost(call: ServiceCall) -> None:
-        """Service call to stop boosting fans in a room."""
-        device_id = call.data["device_id"]
-        device_registry = dr.async_get(hass)
-        device = device_registry.async_get(device_id)
-
-        if device:
-            device_identifier = next(iter(device.identifiers))[1]
-            room_id: int = int(device_identifier.split("_")[-1])
-            await coordinator.stop_room_boost(room_id=room_id)
-
-    # Register Services
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_START_ROOM_BOOST,
-        start_room_boost,
-        SERVICE_START_ROOM_BOOST_SCHEMA,
-    )
-    hass.services.async_register(
-        DOMAIN, SERVICE_STOP_ROOM_BOOST, stop_room_boost, SERVICE_STOP_ROOM_BOOST_SCHEMA
-    )
-    hass.services.async_register(DOMAIN, SERVICE_CHANGE_ROOM_PROFILE,
-                                 change_room_profile, SERVICE_CHANGE_ROOM_PROFILE_SCHEMA)
     entry.async_on_unload(entry.add_update_listener(async_update_options))
     return True
 
@@ -110,15 +85,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DATA_DEVICE_RESOLVER].async_remove_entry(entry.entry_id)
         if not hass.data[DOMAIN]:
             del hass.data[DOMAIN]
 
-        for service in ALL_SERVICES:
-            hass.services.async_remove(DOMAIN, service)
-
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
@@ -1,21 +1,21 @@
 """Sensor platform for healthbox."""
 from __future__ import annotations
 
+from collections.abc import Iterable
 from dataclasses import dataclass
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
 
-from .const import DOMAIN, HealthboxRoom, LOGGER
+from .const import DOMAIN, HealthboxRoom
 from .coordinator import HealthboxDataUpdateCoordinator
+from .entity import HealthboxRoomEntity, async_track_new_rooms
 
 
 @dataclass
@@ -24,9 +24,12 @@ class HealthboxRoomEntityDescriptionMixin:
 
     room: HealthboxRoom
     is_on: bool
+    # Room fields read by is_on; a change to any of them updates the entity.
+    fields: tuple[str, ...] = ()
 
 
-@dataclass
+# Keyword-only: the mixin fields with defaults precede the required key.
+@dataclass(kw_only=True)
 class HealthboxRoomBinarySensorEntityDescription(
     BinarySensorEntityDescription, HealthboxRoomEntityDescriptionMixin
 ):
@@ -35,18 +38,22 @@ class HealthboxRoomBinarySensorEntityDescription(
 
 def generate_binary_room_sensors_for_healthbox(
     coordinator: HealthboxDataUpdateCoordinator,
+    rooms: Iterable[HealthboxRoom] | None = None,
 ) -> list[HealthboxRoomBinarySensorEntityDescription]:
-    """Generate binary sensors for each room."""
+    """Generate binary sensors for each room, or for the given rooms only."""
     room_binary_sensors: list[HealthboxRoomBinarySensorEntityDescription] = []
 
-    for room in coordinator.api.rooms:
+    if rooms is None:
+        rooms = coordinator.data.rooms.values()
+    for room in rooms:
         if room.boost is not None:
             room_binary_sensors.append(
                 HealthboxRoomBinarySensorEntityDescription(
                     key=f"{room.room_id}_boost_status",
                     name=f"{room.name} Boost Status",
                     room=room,
-                    is_on=lambda x: x.boost.enabled
+                    is_on=lambda x: x.boost.enabled,
+                    fields=("boost",),
                 )
             )
 
@@ -73,10 +80,20 @@ async def async_setup_entry(
 
     async_add_entities(entities)
 
+    @callback
+    def _async_add_rooms(rooms: list[HealthboxRoom]) -> None:
+        """Add the binary sensors of rooms that appeared after setup."""
+        async_add_entities(
+            HealthboxRoomBinarySensor(coordinator, description)
+            for description in generate_binary_room_sensors_for_healthbox(
+                coordinator=coordinator, rooms=rooms
+            )
+        )
 
-class HealthboxRoomBinarySensor(
-    CoordinatorEntity[HealthboxDataUpdateCoordinator], BinarySensorEntity
-):
+    async_track_new_rooms(coordinator, config_entry, _async_add_rooms)
+
+
+class HealthboxRoomBinarySensor(HealthboxRoomEntity, BinarySensorEntity):
     """Representation of a Healthbox Room Sensor."""
 
     entity_description: HealthboxRoomBinarySensorEntityDescription
@@ -87,37 +104,15 @@ class HealthboxRoomBinarySensor(
         description: HealthboxRoomBinarySensorEntityDescription,
     ) -> None:
         """Initialize Binary Sensor Domain."""
-        super().__init__(coordinator)
-
-        self.entity_description = description
-        self._attr_unique_id = f"{
-            coordinator.config_entry.entry_id}-{description.room.room_id}-{description.key}"
-        self._attr_name = f"{description.name}"
-        self._attr_device_info = DeviceInfo(
-            name=self.entity_description.room.name,
-            identifiers={
-                (
-                    DOMAIN,
-                    f"{coordinator.config_entry.unique_id}_{
-                        self.entity_description.room.room_id}",
-                )
-            },
-            manufacturer="Renson",
-            model="Healthbox Room",
-        )
+        super().__init__(coordinator, description, description.room)
 
-    @property
-    def is_on(self) -> bool:
+    def _compute_value(self) -> bool | None:
         """Binary Sensor native value."""
-        room_id: int = int(self.entity_description.room.room_id)
-
-        matching_room = [
-            room for room in self.coordinator.api.rooms if int(room.room_id) == room_id
-        ]
-
-        if len(matching_room) != 1:
-            error_msg: str = f"No matching room found for id {room_id}"
-            LOGGER.error(error_msg)
-        else:
-            matching_room = matching_room[0]
-            return self.entity_description.is_on(matching_room)
+        if (room := self._get_room()) is None:
+            return None
+
+        return self.entity_description.is_on(room)
+
+    def _set_value(self, value: bool | None) -> None:
+        """Set the binary sensor value."""
+        self._attr_is_on = value
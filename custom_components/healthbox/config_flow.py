@@ -10,7 +10,6 @@ from homeassistant import config_entries
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.core import callback
 
 from homeassistant.const import CONF_HOST, CONF_API_KEY
@@ -21,7 +20,30 @@ from pyhealthbox3.healthbox3 import (
     Healthbox3ApiClientError,
 )
 
-from .const import DOMAIN, LOGGER
+from .const import (
+    CONF_CO2_DEADBAND,
+    CONF_EXTERNAL_STATISTICS,
+    CONF_FAST_START,
+    CONF_HUMIDITY_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND,
+    DEFAULT_DEADBAND,
+    DOMAIN,
+    LOGGER,
+)
+from .session import async_get_session_pool
+
+
+def _deadband_selector(maximum: float, step: float, unit: str) -> selector.NumberSelector:
+    """Build a number selector for a sensor deadband."""
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=0,
+            max=maximum,
+            step=step,
+            unit_of_measurement=unit,
+            mode=selector.NumberSelectorMode.BOX,
+        )
+    )
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -91,21 +113,29 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def _test_credentials(self, ipaddress: str, apikey: str) -> None:
         """Validate credentials."""
+        session_pool = async_get_session_pool(self.hass)
         client = Healthbox3(
             host=ipaddress,
             api_key=apikey,
-            session=async_create_clientsession(self.hass),
+            session=session_pool.async_acquire(ipaddress),
         )
-        await client.async_enable_advanced_api_features()
+        try:
+            await client.async_enable_advanced_api_features()
+        finally:
+            session_pool.async_release(ipaddress)
 
     async def _test_connectivity(self, ipaddress: str) -> None:
         """Validate connectivity."""
+        session_pool = async_get_session_pool(self.hass)
         client = Healthbox3(
             host=ipaddress,
             api_key=None,
-            session=async_create_clientsession(self.hass),
+            session=session_pool.async_acquire(ipaddress),
         )
-        await client.async_validate_connectivity()
+        try:
+            await client.async_validate_connectivity()
+        finally:
+            session_pool.async_release(ipaddress)
 
 
 class CannotConnect(HomeAssistantError):
@@ -140,9 +170,18 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         data={CONF_HOST: host,
                               CONF_API_KEY: user_input[CONF_API_KEY]},
                     )
-                    hb3 = Healthbox3(host=host, api_key=api_key)
-                    await hb3.async_enable_advanced_api_features(pre_validation=False)
-                    await hb3.close()
+                    session_pool = async_get_session_pool(self.hass)
+                    hb3 = Healthbox3(
+                        host=host,
+                        api_key=api_key,
+                        session=session_pool.async_acquire(host),
+                    )
+                    try:
+                        await hb3.async_enable_advanced_api_features(
+                            pre_validation=False
+                        )
+                    finally:
+                        session_pool.async_release(host)
                 except Healthbox3ApiClientAuthenticationError:
                     pass
                 finally:
@@ -163,7 +202,31 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         selector.TextSelectorConfig(
                             type=selector.TextSelectorType.PASSWORD
                         )
-                    )
+                    ),
+                    vol.Optional(
+                        CONF_TEMPERATURE_DEADBAND,
+                        default=self.entry.options.get(
+                            CONF_TEMPERATURE_DEADBAND, DEFAULT_DEADBAND),
+                    ): _deadband_selector(maximum=5, step=0.1, unit="°C"),
+                    vol.Optional(
+                        CONF_HUMIDITY_DEADBAND,
+                        default=self.entry.options.get(
+                            CONF_HUMIDITY_DEADBAND, DEFAULT_DEADBAND),
+                    ): _deadband_selector(maximum=20, step=0.5, unit="%"),
+                    vol.Optional(
+                        CONF_CO2_DEADBAND,
+                        default=self.entry.options.get(
+                            CONF_CO2_DEADBAND, DEFAULT_DEADBAND),
+                    ): _deadband_selector(maximum=500, step=1, unit="ppm"),
+                    vol.Optional(
+                        CONF_FAST_START,
+                        default=self.entry.options.get(CONF_FAST_START, False),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_EXTERNAL_STATISTICS,
+                        default=self.entry.options.get(
+                            CONF_EXTERNAL_STATISTICS, False),
+                    ): selector.BooleanSelector(),
                 }
             ),
             errors=errors,
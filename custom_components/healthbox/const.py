@@ -1,159 +1,497 @@
 """Constants for the Renson Healthbox integration."""
+from __future__ import annotations
+
 import voluptuous as vol
 
 from logging import Logger, getLogger
+from collections.abc import Collection
+from dataclasses import asdict, dataclass, field
 from datetime import timedelta
 from decimal import Decimal
+from typing import Any
 
-from homeassistant.const import Platform
+from homeassistant.const import ATTR_AREA_ID, ATTR_DEVICE_ID, Platform
 from homeassistant.helpers import config_validation as cv
 
+from pyhealthbox3.models import Healthbox3RoomBoost
+
 LOGGER: Logger = getLogger(__package__)
 
 NAME = "Healthbox "
 DOMAIN = "healthbox"
+DATA_DEVICE_RESOLVER = f"{DOMAIN}_device_resolver"
+DATA_SESSION_POOL = f"{DOMAIN}_session_pool"
+DATA_FLEET_SCHEDULER = f"{DOMAIN}_fleet_scheduler"
+# Sent with the entry id when the coordinator state changes outside a fan-out.
+SIGNAL_COORDINATOR_STATE = f"{DOMAIN}_coordinator_state_{{}}"
 VERSION = "0.0.1"
 MANUFACTURER = "Renson"
 ATTRIBUTION = ""
 SCAN_INTERVAL = timedelta(seconds=5)
 
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+MAX_SCAN_INTERVAL = timedelta(seconds=60)
+SCAN_INTERVAL_BACKOFF_FACTOR = 2
+METADATA_SCAN_INTERVAL = timedelta(minutes=5)
+COMMAND_REFRESH_COOLDOWN = 2
+
+# Keep connections open across the longest poll interval.
+HTTP_KEEPALIVE_TIMEOUT = 75
+HTTP_CONNECT_TIMEOUT = 3
+HTTP_TOTAL_TIMEOUT = 10
+# Connections kept per Healthbox: a poll plus a few concurrent room commands.
+HTTP_MAX_CONNECTIONS_PER_HOST = 4
+
+ENDPOINT_CURRENT_DATA = "/v2/api/data/current"
+ENDPOINT_FAN = "/v2/device/fan"
+ENDPOINT_ERRORS = "/v2/device/error"
+ENDPOINT_GLOBAL_CORE = "/renson_core/v2/global"
+ENDPOINT_WIFI_STATUS = "/renson_core/v1/wifi/client/status"
+
+REFRESH_TIMING_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+POLL_REASON_STARTUP = "startup"
+POLL_REASON_BOOST = "boost_active"
+POLL_REASON_CHANGING = "values_changing"
+POLL_REASON_STABLE = "values_stable"
+POLL_REASON_ERROR = "device_error"
+POLL_REASON_COMMAND = "command"
+POLL_REASON_RECOVERED = "recovered"
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+BREAKER_STATES = [BREAKER_CLOSED, BREAKER_OPEN, BREAKER_HALF_OPEN]
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BASE_DELAY = timedelta(seconds=30)
+BREAKER_MAX_DELAY = timedelta(minutes=10)
+
 PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR]
 
+CONF_FAST_START = "fast_start"
+CONF_EXTERNAL_STATISTICS = "external_statistics"
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+CONF_HUMIDITY_DEADBAND = "humidity_deadband"
+CONF_CO2_DEADBAND = "co2_deadband"
+DEFAULT_DEADBAND = 0
+STATISTICS_WINDOW = timedelta(minutes=5)
+
+ROOM_DEVICE_MODEL = "Healthbox Room"
+MAX_PARALLEL_COMMANDS = 4
+FLEET_MAX_IN_FLIGHT = 4
+
+ROOM_TARGET_SCHEMA = {
+    vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_AREA_ID): vol.All(cv.ensure_list, [cv.string]),
+}
+
 SERVICE_CHANGE_ROOM_PROFILE = "change_room_profile"
-SERVICE_CHANGE_ROOM_PROFILE_SCHEMA = vol.Schema(
-    {
-        vol.Required(cv.CONF_DEVICE_ID): cv.string,
-        vol.Required("profile_name"): cv.string
-    }
+SERVICE_CHANGE_ROOM_PROFILE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **ROOM_TARGET_SCHEMA,
+            vol.Required("profile_name"): cv.string
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_DEVICE_ID, ATTR_AREA_ID),
 )
 
 SERVICE_START_ROOM_BOOST = "start_room_boost"
-SERVICE_START_ROOM_BOOST_SCHEMA = vol.Schema(
-    {
-        vol.Required(cv.CONF_DEVICE_ID): cv.string,
-        vol.Required("boost_level"): vol.All(int, vol.Range(min=10, max=200)),
-        vol.Required("boost_timeout"): vol.All(int, vol.Range(min=5, max=720)),
-    }
+SERVICE_START_ROOM_BOOST_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **ROOM_TARGET_SCHEMA,
+            vol.Required("boost_level"): vol.All(int, vol.Range(min=10, max=200)),
+            vol.Required("boost_timeout"): vol.All(int, vol.Range(min=5, max=720)),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_DEVICE_ID, ATTR_AREA_ID),
 )
 
 SERVICE_STOP_ROOM_BOOST = "stop_room_boost"
-SERVICE_STOP_ROOM_BOOST_SCHEMA = vol.Schema(
-    {vol.Required("device_id"): cv.string},
+SERVICE_STOP_ROOM_BOOST_SCHEMA = vol.All(
+    vol.Schema(ROOM_TARGET_SCHEMA),
+    cv.has_at_least_one_key(ATTR_DEVICE_ID, ATTR_AREA_ID),
+)
+
+SERVICE_DUMP_TELEMETRY = "dump_telemetry"
+SERVICE_DUMP_TELEMETRY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("metric"): cv.string,
+        vol.Optional("samples"): vol.All(int, vol.Range(min=1)),
+    }
 )
 
 ALL_SERVICES = [
     SERVICE_START_ROOM_BOOST,
     SERVICE_STOP_ROOM_BOOST,
-    SERVICE_CHANGE_ROOM_PROFILE
+    SERVICE_CHANGE_ROOM_PROFILE,
+    SERVICE_DUMP_TELEMETRY,
 ]
 
 
+# One hour of samples at the fastest poll interval.
+TELEMETRY_CAPACITY = 720
+ROOM_TELEMETRY_METRICS: dict[str, str] = {
+    "temperature": "indoor_temperature",
+    "humidity": "indoor_humidity",
+    "co2": "indoor_co2_concentration",
+    "aqi": "indoor_aqi",
+    "voc": "indoor_voc_ppm",
+    "ventilation_rate": "airflow_ventilation_rate",
+}
+FAN_TELEMETRY_METRICS: dict[str, str] = {
+    "fan_power": "power",
+    "fan_flow": "flow",
+    "fan_rpm": "rpm",
+    "fan_pressure": "pressure",
+}
+
+# Telemetry metrics with a rate of change and rolling means, and the mean windows in minutes.
+DERIVED_ROOM_METRICS: dict[str, str] = {
+    "co2": "indoor_co2_concentration",
+    "humidity": "indoor_humidity",
+}
+DERIVED_MEAN_WINDOWS = (5, 15, 60)
+DERIVED_RATE_TIME_CONSTANT = timedelta(minutes=5)
+# Fan power is not integrated over gaps longer than this, e.g. while unreachable.
+DERIVED_MAX_GAP = timedelta(minutes=5)
+
+SENSOR_TYPE_PARAMETERS: dict[str, str] = {
+    "indoor temperature": "temperature",
+    "indoor relative humidity": "humidity",
+    "indoor CO2": "concentration",
+    "indoor air quality index": "index",
+    "indoor volatile organic compounds": "concentration",
+}
+SENSOR_TYPE_FIELDS: dict[str, str] = {
+    "indoor temperature": "indoor_temperature",
+    "indoor relative humidity": "indoor_humidity",
+    "indoor CO2": "indoor_co2_concentration",
+    "indoor air quality index": "indoor_aqi",
+    "indoor volatile organic compounds": "indoor_voc_ppm",
+}
+FIELD_SENSOR_TYPES: dict[str, str] = {
+    name: sensor_type for sensor_type, name in SENSOR_TYPE_FIELDS.items()
+}
+# Projection path of the fan endpoint; room projection paths are sensor types.
+PROJECTION_FAN = "fan"
+
+
+@dataclass(frozen=True, slots=True)
 class HealthboxRoomBoost:
     """Healthbox  Room Boost object."""
 
-    level: float
-    enabled: bool
-    remaining: int
+    level: float | None = 100
+    enabled: bool = False
+    remaining: int | None = 900
 
-    def __init__(
-        self, level: float = 100, enabled: bool = False, remaining: int = 900
-    ) -> None:
-        """Initialize the HB Room Boost."""
-        self.level = level
-        self.enabled = enabled
-        self.remaining = remaining
+    @classmethod
+    def from_api(cls, boost: Healthbox3RoomBoost) -> HealthboxRoomBoost:
+        """Create the HB Room Boost from the library boost."""
+        return cls(
+            level=boost.level, enabled=boost.enabled, remaining=boost.remaining
+        )
 
 
+@dataclass(slots=True)
 class HealthboxRoom:
     """Healthbox  Room object."""
 
-    boost: HealthboxRoomBoost = None
-
-    def __init__(self, room_id: int, room_data: object) -> None:
-        """Initialize the HB Room."""
-        self.room_id: int = room_id
-        self.name: str = room_data["name"]
-        self.type: str = room_data["type"]
-        self.sensors_data: list = room_data["sensor"]
-        self.room_type: str = room_data["type"]
-
-    @property
-    def indoor_temperature(self) -> Decimal:
-        """HB Indoor Temperature."""
-        return [
-            sensor["parameter"]["temperature"]["value"]
-            for sensor in self.sensors_data
-            if "temperature" in sensor["parameter"]
-        ][0]
-
-    @property
-    def indoor_humidity(self) -> Decimal:
-        """HB Indoor Humidity."""
-        return [
-            sensor["parameter"]["humidity"]["value"]
-            for sensor in self.sensors_data
-            if "humidity" in sensor["parameter"]
-        ][0]
-
-    @property
-    def indoor_co2_concentration(self) -> Decimal | None:
-        """HB Indoor CO2 Concentration."""
-        co2_concentration = None
-        try:
-            co2_concentration = [
-                sensor["parameter"]["concentration"]["value"]
-                for sensor in self.sensors_data
-                if "concentration" in sensor["parameter"]
-            ][0]
-        except IndexError:
-            co2_concentration = None
-        return co2_concentration
-
-    @property
-    def indoor_aqi(self) -> Decimal | None:
-        """HB Indoor Air Quality Index."""
-        aqi = None
-        try:
-            aqi = [
-                sensor["parameter"]["index"]["value"]
-                for sensor in self.sensors_data
-                if "index" in sensor["parameter"]
-            ][0]
-        except IndexError:
-            aqi = None
-        return aqi
+    room_id: int
+    name: str
+    room_type: str
+    enabled_sensors: tuple[str, ...] = ()
+    indoor_temperature: Decimal | None = None
+    indoor_humidity: Decimal | None = None
+    indoor_co2_concentration: Decimal | None = None
+    indoor_aqi: Decimal | None = None
+    indoor_voc_ppm: Decimal | None = None
+    airflow_ventilation_rate: float | None = None
+    profile_name: str | None = None
+    boost: HealthboxRoomBoost | None = None
+    derived: dict[str, float | None] = field(default_factory=dict)
+
+    @classmethod
+    def from_api(
+        cls,
+        room_id: int,
+        room: dict[str, Any],
+        boost: HealthboxRoomBoost | None = None,
+        advanced_features: bool = False,
+    ) -> HealthboxRoom:
+        """Create the HB Room from its entry in the current data payload."""
+        return cls(
+            room_id=room_id,
+            **cls._fields_from_api(room, boost, advanced_features),
+        )
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HealthboxRoom:
+        """Create the HB Room from its stored form."""
+        boost = data.get("boost")
+        return cls(
+            **data
+            | {
+                "enabled_sensors": tuple(data.get("enabled_sensors", ())),
+                "boost": HealthboxRoomBoost(**boost) if boost is not None else None,
+            }
+        )
 
+    def update_from_api(
+        self,
+        room: dict[str, Any],
+        boost: HealthboxRoomBoost | None = None,
+        advanced_features: bool = False,
+        sensor_types: Collection[str] | None = None,
+    ) -> set[str]:
+        """Patch the HB Room in place and return the names of changed fields.
+
+        With sensor_types, the readings of other sensor types keep their value.
+        """
+        changed: set[str] = set()
+        for name, value in self._fields_from_api(
+            room, boost, advanced_features, sensor_types
+        ).items():
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                changed.add(name)
+        return changed
+
+    @classmethod
+    def _fields_from_api(
+        cls,
+        room: dict[str, Any],
+        boost: HealthboxRoomBoost | None,
+        advanced_features: bool,
+        sensor_types: Collection[str] | None = None,
+    ) -> dict[str, object]:
+        """Extract the room fields read by the platforms from the payload room.
+
+        Only the sensors of the requested types are read; the readings need
+        the advanced API.
+        """
+        enabled_sensors, readings = cls._index_sensors(
+            room["sensor"], sensor_types if advanced_features else ()
+        )
+        fields: dict[str, object] = {
+            "name": room["name"],
+            "room_type": room["type"],
+            "enabled_sensors": enabled_sensors,
+            "airflow_ventilation_rate": cls._ventilation_rate(room),
+            "profile_name": room["profile_name"].capitalize(),
+            "boost": boost,
+        }
+        for sensor_type, name in SENSOR_TYPE_FIELDS.items():
+            if sensor_types is None or sensor_type in sensor_types:
+                fields[name] = readings.get(sensor_type)
+        return fields
+
+    @staticmethod
+    def _index_sensors(
+        sensors_data: list[dict[str, Any]], sensor_types: Collection[str] | None
+    ) -> tuple[tuple[str, ...], dict[str, Decimal]]:
+        """Return the sensor types and the first value of each requested type."""
+        readings: dict[str, Decimal] = {}
+        enabled_sensors: list[str] = []
+        for sensor in sensors_data:
+            sensor_type: str = sensor["type"]
+            enabled_sensors.append(sensor_type)
+            if sensor_type in readings or (
+                sensor_types is not None and sensor_type not in sensor_types
+            ):
+                continue
+            if (parameter := SENSOR_TYPE_PARAMETERS.get(sensor_type)) is None:
+                continue
+            if parameter in (values := sensor.get("parameter", {})):
+                readings[sensor_type] = values[parameter]["value"]
+        return tuple(enabled_sensors), readings
+
+    @staticmethod
+    def _ventilation_rate(room: dict[str, Any]) -> float | None:
+        """Return the air valve flow rate relative to the nominal flow rate."""
+        parameters = room["parameter"]
+        if "value" not in (nominal := parameters.get("nominal", {})):
+            return None
+        offset = parameters.get("offset", {}).get("value", 0)
+        for actuator in room["actuator"]:
+            if actuator["type"] != "air valve":
+                continue
+            if "value" not in (
+                flow_rate := actuator.get("parameter", {}).get("flow_rate", {})
+            ):
+                return None
+            return flow_rate["value"] / (nominal["value"] + offset)
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class HealthboxWifi:
+    """Healthbox WiFi object."""
+
+    status: str | None = None
+    internet_connection: str | None = None
+    ssid: str | None = None
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> HealthboxWifi:
+        """Create the WiFi status from the WiFi client status endpoint."""
+        return cls(
+            status=data.get("status"),
+            internet_connection=data.get("internet_connection"),
+            ssid=data.get("ssid"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class HealthboxFan:
+    """Healthbox Fan object."""
+
+    voltage: float | None = None
+    pressure: float | None = None
+    flow: float | None = None
+    power: float | None = None
+    rpm: int | None = None
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> HealthboxFan:
+        """Create the fan status from the fan endpoint."""
+        return cls(
+            voltage=data.get("voltage"),
+            pressure=data.get("pressure"),
+            flow=data.get("flow"),
+            power=data.get("power"),
+            rpm=data.get("rpm"),
+        )
+
+
+@dataclass(slots=True)
+class HealthboxChangeSet:
+    """Fields that changed between two Healthbox refreshes."""
+
+    fields: set[str] = field(default_factory=set)
+    rooms: dict[int, set[str]] = field(default_factory=dict)
+    added_rooms: set[int] = field(default_factory=set)
+    removed_rooms: set[int] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        """Return whether anything changed."""
+        return bool(self.fields or self.rooms or self.added_rooms or self.removed_rooms)
+
+
+@dataclass(slots=True)
 class HealthboxDataObject:
     """Healthbox Data Object."""
 
     serial: str
     description: str
     warranty_number: str
+    firmware_version: str | None = None
+    advanced_api_enabled: bool = False
+    global_aqi: float | None = None
+    error_count: int | None = None
+    wifi: HealthboxWifi = HealthboxWifi()
+    fan: HealthboxFan = HealthboxFan()
+    fan_energy: float | None = None
+    rooms: dict[int, HealthboxRoom] = field(default_factory=dict)
+
+    @classmethod
+    def from_api(
+        cls,
+        payload: dict[str, Any],
+        boosts: dict[int, HealthboxRoomBoost],
+        advanced_api_enabled: bool,
+    ) -> HealthboxDataObject:
+        """Create a snapshot from the current data payload and the room boosts."""
+        data = cls(**cls._fields_from_api(payload, advanced_api_enabled))
+        for key, room in payload["room"].items():
+            room_id = int(key)
+            data.rooms[room_id] = HealthboxRoom.from_api(
+                room_id, room, boosts.get(room_id), advanced_api_enabled
+            )
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HealthboxDataObject:
+        """Create a snapshot from its stored form."""
+        return cls(
+            **data
+            | {
+                "wifi": HealthboxWifi(**data.get("wifi", {})),
+                "fan": HealthboxFan(**data.get("fan", {})),
+                "rooms": {
+                    int(room_id): HealthboxRoom.from_dict(room)
+                    for room_id, room in data.get("rooms", {}).items()
+                },
+            }
+        )
 
-    global_aqi: float = None
+    def as_dict(self) -> dict[str, Any]:
+        """Return the snapshot in a form that can be stored."""
+        return asdict(self)
 
-    rooms: list[HealthboxRoom]
+    def update_from_api(
+        self,
+        payload: dict[str, Any],
+        boosts: dict[int, HealthboxRoomBoost],
+        advanced_api_enabled: bool,
+        sensor_types: Collection[str] | None = None,
+    ) -> HealthboxChangeSet:
+        """Patch the snapshot in place from the current data and return what changed.
 
-    def __init__(self, data: any) -> None:
-        """Initialize."""
-        self.serial = data["serial"]
-        self.description = data["description"]
-        self.warranty_number = data["warranty_number"]
+        With sensor_types, existing rooms only read those sensor types. New rooms
+        are always parsed in full, because their entities are generated from them.
+        """
+        changes = HealthboxChangeSet()
+        self.update_fields(
+            self._fields_from_api(payload, advanced_api_enabled), changes
+        )
 
-        self.global_aqi = self._get_global_aqi_from_data(data)
+        seen: set[int] = set()
+        for key, room in payload["room"].items():
+            room_id = int(key)
+            seen.add(room_id)
+            if (hb_room := self.rooms.get(room_id)) is None:
+                self.rooms[room_id] = HealthboxRoom.from_api(
+                    room_id, room, boosts.get(room_id), self.advanced_api_enabled
+                )
+                changes.added_rooms.add(room_id)
+            elif changed := hb_room.update_from_api(
+                room, boosts.get(room_id), self.advanced_api_enabled, sensor_types
+            ):
+                changes.rooms[room_id] = changed
 
-        hb_rooms: list[HealthboxRoom] = []
-        for room in data["room"]:
-            hb_room = HealthboxRoom(room, data["room"][room])
-            hb_rooms.append(hb_room)
+        for room_id in self.rooms.keys() - seen:
+            del self.rooms[room_id]
+            changes.removed_rooms.add(room_id)
 
-        self.rooms = hb_rooms
+        return changes
 
-    def _get_global_aqi_from_data(self, data: any) -> float | None:
-        """Set Global AQI from Data Object."""
-        sensors = data["sensor"]
-        for sensor in sensors:
+    def update_fields(
+        self, fields: dict[str, object], changes: HealthboxChangeSet
+    ) -> None:
+        """Patch the given global fields and record the ones that changed."""
+        for name, value in fields.items():
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                changes.fields.add(name)
+
+    @staticmethod
+    def _fields_from_api(
+        payload: dict[str, Any], advanced_api_enabled: bool
+    ) -> dict[str, object]:
+        """Extract the global fields of the current data read by the platforms."""
+        global_aqi = None
+        for sensor in payload["sensor"]:
             if sensor["type"] == "global air quality index":
-                return sensor["parameter"]["index"]["value"]
-        return None
+                global_aqi = sensor["parameter"]["index"]["value"]
+                break
+        return {
+            "serial": payload["serial"],
+            "description": payload["description"],
+            "warranty_number": payload["warranty_number"],
+            "advanced_api_enabled": advanced_api_enabled,
+            "global_aqi": global_aqi,
+        }
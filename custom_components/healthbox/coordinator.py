@@ -1,28 +1,231 @@
 """DataUpdateCoordinator for healthbox."""
 from __future__ import annotations
 
+import asyncio
+import random
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime, timedelta
+from operator import attrgetter
+from time import monotonic, perf_counter
+from typing import Any
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.const import CONF_HOST
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
 
+from aiohttp import ClientError, ClientSession
 
 from pyhealthbox3.healthbox3 import (
     Healthbox3,
     Healthbox3ApiClientAuthenticationError,
+    Healthbox3ApiClientCommunicationError,
     Healthbox3ApiClientError,
 )
 
 from .const import (
+    BREAKER_BASE_DELAY,
+    BREAKER_CLOSED,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_HALF_OPEN,
+    BREAKER_MAX_DELAY,
+    BREAKER_OPEN,
+    COMMAND_REFRESH_COOLDOWN,
     DOMAIN,
+    ENDPOINT_CURRENT_DATA,
+    ENDPOINT_ERRORS,
+    ENDPOINT_FAN,
+    ENDPOINT_GLOBAL_CORE,
+    ENDPOINT_WIFI_STATUS,
+    HealthboxChangeSet,
+    HealthboxDataObject,
+    HealthboxFan,
+    HealthboxRoom,
+    HealthboxRoomBoost,
+    HealthboxWifi,
     LOGGER,
+    MAX_PARALLEL_COMMANDS,
+    MAX_SCAN_INTERVAL,
+    METADATA_SCAN_INTERVAL,
+    POLL_REASON_BOOST,
+    POLL_REASON_CHANGING,
+    POLL_REASON_COMMAND,
+    POLL_REASON_ERROR,
+    POLL_REASON_RECOVERED,
+    POLL_REASON_STABLE,
+    POLL_REASON_STARTUP,
+    PROJECTION_FAN,
+    REFRESH_TIMING_BUCKETS,
     SCAN_INTERVAL,
+    SCAN_INTERVAL_BACKOFF_FACTOR,
+    SIGNAL_COORDINATOR_STATE,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
 )
+from .scheduler import HealthboxFleetScheduler
+from .statistics import HealthboxStatisticsImporter
+from .telemetry import HealthboxDerivedCalculator, HealthboxTelemetry
+
+
+class HealthboxTimingHistogram:
+    """Histogram of refresh phase durations in seconds."""
+
+    __slots__ = ("buckets", "count", "total", "last", "max")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets: list[int] = [0] * (len(REFRESH_TIMING_BUCKETS) + 1)
+        self.count: int = 0
+        self.total: float = 0
+        self.last: float | None = None
+        self.max: float = 0
+
+    def record(self, duration: float) -> None:
+        """Add a duration to the histogram."""
+        self.buckets[bisect_left(REFRESH_TIMING_BUCKETS, duration)] += 1
+        self.count += 1
+        self.total += duration
+        self.last = duration
+        self.max = max(self.max, duration)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        bounds = [f"le_{bound}" for bound in REFRESH_TIMING_BUCKETS] + ["le_inf"]
+        return {
+            "count": self.count,
+            "last": self.last,
+            "mean": self.total / self.count if self.count else None,
+            "max": self.max,
+            "buckets": dict(zip(bounds, self.buckets)),
+        }
+
+
+class HealthboxRefreshStats:
+    """Timings and counters of the coordinator refreshes."""
+
+    __slots__ = (
+        "request",
+        "parse",
+        "fan_out",
+        "lateness",
+        "payload_size",
+        "success_count",
+        "failure_count",
+        "last_error",
+        "last_error_time",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.request = HealthboxTimingHistogram()
+        self.parse = HealthboxTimingHistogram()
+        self.fan_out = HealthboxTimingHistogram()
+        self.lateness = HealthboxTimingHistogram()
+        self.payload_size: int | None = None
+        self.success_count: int = 0
+        self.failure_count: int = 0
+        self.last_error: str | None = None
+        self.last_error_time: datetime | None = None
+
+    def record_failure(self, exception: Exception) -> None:
+        """Count a failed refresh."""
+        self.failure_count += 1
+        self.last_error = f"{type(exception).__name__}: {exception}"
+        self.last_error_time = dt_util.utcnow()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {
+            "request": self.request.as_dict(),
+            "parse": self.parse.as_dict(),
+            "fan_out": self.fan_out.as_dict(),
+            "lateness": self.lateness.as_dict(),
+            "payload_size": self.payload_size,
+            "success_count": self.success_count,
+            "failure_count": self.failure_count,
+            "last_error": self.last_error,
+            "last_error_time": self.last_error_time,
+        }
+
+
+class HealthboxPendingCommand:
+    """Values a room command applied optimistically, until a poll confirms them."""
+
+    __slots__ = ("values", "expected", "finished")
+
+    def __init__(self) -> None:
+        """Initialize without values."""
+        self.values: dict[str, object] = {}
+        self.expected: dict[str, object] = {}
+        self.finished: float = 0
+
+    def update(
+        self, values: dict[str, object], expected: dict[str, object], finished: float
+    ) -> None:
+        """Add the values of a command that finished at the given monotonic time."""
+        self.values.update(values)
+        self.expected.update(expected)
+        self.finished = max(self.finished, finished)
+
+
+class HealthboxCircuitBreaker:
+    """Circuit breaker that stops polling a Healthbox that keeps failing."""
+
+    __slots__ = ("state", "failures", "trips")
+
+    def __init__(self) -> None:
+        """Initialize a closed breaker."""
+        self.state: str = BREAKER_CLOSED
+        self.failures: int = 0
+        self.trips: int = 0
+
+    def probe(self) -> bool:
+        """Let the next request through and return whether the breaker was open."""
+        if self.state != BREAKER_OPEN:
+            return False
+        self.state = BREAKER_HALF_OPEN
+        return True
+
+    def record_success(self) -> bool:
+        """Close the breaker and return whether it was open or half-open."""
+        tripped = self.state != BREAKER_CLOSED
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.trips = 0
+        return tripped
+
+    def record_failure(self) -> timedelta | None:
+        """Count a failure and return the delay until the next probe once open."""
+        self.failures += 1
+        if self.state == BREAKER_CLOSED and self.failures < BREAKER_FAILURE_THRESHOLD:
+            return None
+
+        self.state = BREAKER_OPEN
+        self.trips += 1
+        delay = min(
+            BREAKER_BASE_DELAY.total_seconds() * 2 ** (self.trips - 1),
+            BREAKER_MAX_DELAY.total_seconds(),
+        )
+        # Spread the probes of several unreachable boxes over the second half.
+        return timedelta(seconds=delay / 2 + random.uniform(0, delay / 2))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker for diagnostics."""
+        return {"state": self.state, "failures": self.failures, "trips": self.trips}
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
@@ -33,8 +236,15 @@ class HealthboxDataUpdateCoordinator(DataUpdateCoordinator):
 
     api: Healthbox3
 
+    data: HealthboxDataObject
+
     def __init__(
-        self, hass: HomeAssistant, entry: ConfigEntry, api: Healthbox3
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        api: Healthbox3,
+        scheduler: HealthboxFleetScheduler,
+        session: ClientSession,
     ) -> None:
         """Initialize."""
 
@@ -42,14 +252,341 @@ class HealthboxDataUpdateCoordinator(DataUpdateCoordinator):
         self.config_entry = entry
         self.host: str = entry.data[CONF_HOST]
         self.api: Healthbox3 = api
+        self.session = session
+        self.scheduler = scheduler
+        self.state_signal = SIGNAL_COORDINATOR_STATE.format(entry.entry_id)
+        self.poll_interval: timedelta = SCAN_INTERVAL
+        self.poll_reason: str = POLL_REASON_STARTUP
+        self._next_poll_at: float | None = None
+        self._poll_handle: asyncio.TimerHandle | None = None
+        self._polling = True
+        self.changes: HealthboxChangeSet = HealthboxChangeSet()
+        self._pending: dict[int, HealthboxPendingCommand] = {}
+        self.stats = HealthboxRefreshStats()
+        self.breaker = HealthboxCircuitBreaker()
+        self.telemetry = HealthboxTelemetry()
+        self.derived = HealthboxDerivedCalculator(self.telemetry)
+        self.statistics = HealthboxStatisticsImporter(hass)
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+        )
+        self._save_due: float | None = None
+        self._advanced_api_ready: asyncio.Event | None = None
+        self._topology: dict[str, Any] | None = None
+        self._metadata_refreshed: float | None = None
+        self._refresh_task: asyncio.Task[HealthboxDataObject] | None = None
+        self._reads: Counter[str] = Counter()
+        self._projection_active = False
 
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=f"{DOMAIN} - {self.host}",
-            update_interval=SCAN_INTERVAL,
+            # The polls are scheduled in the fleet slot by _async_schedule_poll.
+            update_interval=None,
+            # A burst of commands or manual updates leads to a single follow-up poll.
+            request_refresh_debouncer=Debouncer(
+                hass, LOGGER, cooldown=COMMAND_REFRESH_COOLDOWN, immediate=False
+            ),
+        )
+
+    @property
+    def projection(self) -> frozenset[str] | None:
+        """Return the payload paths read by the entities, or None to parse all."""
+        if not self._projection_active:
+            return None
+        return frozenset(path for path, users in self._reads.items() if users > 0)
+
+    @callback
+    def async_project(self, paths: Iterable[str]) -> CALLBACK_TYPE:
+        """Keep parsing the given payload paths until the returned callback is called."""
+        paths = tuple(paths)
+        self._reads.update(paths)
+
+        @callback
+        def _async_remove() -> None:
+            self._reads.subtract(paths)
+
+        return _async_remove
+
+    @callback
+    def async_activate_projection(self) -> None:
+        """Only parse the paths read by the entities from now on.
+
+        Called once the platforms are set up: until then the full payload is
+        parsed, because the platforms generate their entities from it.
+        """
+        self._projection_active = True
+
+    async def async_restore(self) -> bool:
+        """Restore the last stored snapshot and return whether there was one."""
+        if (stored := await self._store.async_load()) is None:
+            return False
+        try:
+            self.data = HealthboxDataObject.from_dict(stored["data"])
+            self._topology = stored.get("topology")
+        except (KeyError, TypeError, ValueError) as exception:
+            LOGGER.warning("Ignoring stored Healthbox data: %s", exception)
+            return False
+        return True
+
+    async def async_start(self, enable_advanced_api: bool) -> None:
+        """Enable the advanced API and run the first refresh concurrently."""
+        if not enable_advanced_api:
+            await self.async_refresh()
+            return
+
+        self._advanced_api_ready = asyncio.Event()
+
+        async def _enable_advanced_api() -> None:
+            try:
+                await self.api.async_enable_advanced_api_features()
+            except Healthbox3ApiClientAuthenticationError as exception:
+                # The entities are already set up, so ask for a new key instead
+                # of failing the setup like the first refresh would.
+                LOGGER.error("The Healthbox rejected the API key: %s", exception)
+                self.config_entry.async_start_reauth(self.hass)
+            except Healthbox3ApiClientError as exception:
+                LOGGER.error("Unable to enable the advanced API: %s", exception)
+            finally:
+                self._advanced_api_ready.set()
+
+        await asyncio.gather(_enable_advanced_api(), self.async_refresh())
+        self._advanced_api_ready = None
+
+    @callback
+    def _data_to_store(self, data: HealthboxDataObject | None = None) -> dict[str, Any]:
+        """Return the data to store, by default the snapshot of the last refresh."""
+        if data is None:
+            data = self.data
+        return {"topology": self._topology, "data": data.as_dict()}
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the snapshot once per save delay.
+
+        Store.async_delay_save moves a pending write back on every call, which
+        at the poll interval would postpone it until shutdown, so it is only
+        called when the previous delayed write is due.
+        """
+        now = monotonic()
+        if self._save_due is not None and now < self._save_due:
+            return
+        self._save_due = now + STORAGE_SAVE_DELAY
+        self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    @staticmethod
+    def _build_topology(data: HealthboxDataObject) -> dict[str, Any]:
+        """Return the rooms and firmware the entities are generated from."""
+        return {
+            "firmware_version": data.firmware_version,
+            "rooms": {
+                str(room_id): {
+                    "name": room.name,
+                    "room_type": room.room_type,
+                    "enabled_sensors": list(room.enabled_sensors),
+                }
+                for room_id, room in data.rooms.items()
+            },
+        }
+
+    async def _async_sync_topology(self, data: HealthboxDataObject) -> None:
+        """Store the topology and reload the entry when the firmware changed.
+
+        Rooms that appear or disappear are handled incrementally by the platforms
+        and _async_remove_rooms, so they only update the stored topology.
+        """
+        topology = self._build_topology(data)
+        previous = self._topology
+        firmware_changed = (
+            previous is not None
+            and None not in (previous["firmware_version"], topology["firmware_version"])
+            and previous["firmware_version"] != topology["firmware_version"]
+        )
+        if (
+            previous is not None
+            and not firmware_changed
+            and previous["rooms"].keys() == topology["rooms"].keys()
+        ):
+            return
+
+        self._topology = topology
+        # The first refresh has not returned its snapshot to self.data yet.
+        await self._store.async_save(self._data_to_store(data))
+        if firmware_changed:
+            LOGGER.info("Healthbox %s firmware changed, reloading", self.host)
+            self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
+
+    @callback
+    def _async_remove_rooms(self, room_ids: Iterable[int]) -> None:
+        """Detach the devices, and with them the entities, of removed rooms."""
+        device_registry = dr.async_get(self.hass)
+        entry = self.config_entry
+        for room_id in room_ids:
+            LOGGER.info("Healthbox %s room %s was removed", self.host, room_id)
+            self._pending.pop(room_id, None)
+            self.telemetry.remove_room(room_id)
+            self.derived.remove_room(room_id)
+            device = device_registry.async_get_device(
+                identifiers={(DOMAIN, f"{entry.unique_id}_{room_id}")}
+            )
+            if device is not None:
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=entry.entry_id
+                )
+
+    @callback
+    def _async_notify_state(self) -> None:
+        """Update the coordinator diagnostics outside a listener fan-out.
+
+        DataUpdateCoordinator only updates its listeners on the first of several
+        failed refreshes, so the breaker, poll interval and failure sensors also
+        follow this signal.
+        """
+        async_dispatcher_send(self.hass, self.state_signal)
+
+    def _set_poll_interval(self, interval: timedelta, reason: str) -> None:
+        """Set the interval used to schedule the next poll."""
+        self.poll_interval = min(interval, MAX_SCAN_INTERVAL)
+        self.poll_reason = reason
+
+    def _back_off(self, reason: str) -> None:
+        """Increase the poll interval exponentially."""
+        self._set_poll_interval(
+            self.poll_interval * SCAN_INTERVAL_BACKOFF_FACTOR, reason
+        )
+
+    def _trip_breaker(self) -> None:
+        """Count a failed refresh and stop polling while the Healthbox is down."""
+        if (delay := self.breaker.record_failure()) is None:
+            self._back_off(POLL_REASON_ERROR)
+            return
+
+        if self.breaker.trips == 1:
+            LOGGER.warning(
+                "Healthbox %s is unreachable, polling less often until it responds",
+                self.host,
+            )
+        # The breaker delay may exceed the regular maximum poll interval.
+        self.poll_interval = delay
+        self.poll_reason = POLL_REASON_ERROR
+
+    @callback
+    def _async_schedule_poll(self) -> None:
+        """Schedule the next poll in the fleet slot of this Healthbox."""
+        self._async_cancel_poll()
+        # Like DataUpdateCoordinator, respect the polling system option of the entry.
+        if not self._polling or self.config_entry.pref_disable_polling:
+            return
+        loop = self.hass.loop
+        self._next_poll_at = self.scheduler.next_slot(
+            self.config_entry.entry_id, loop.time() + self.poll_interval.total_seconds()
+        )
+        self._poll_handle = loop.call_at(self._next_poll_at, self._async_handle_poll)
+
+    @callback
+    def _async_cancel_poll(self) -> None:
+        """Cancel the scheduled poll."""
+        if self._poll_handle is not None:
+            self._poll_handle.cancel()
+            self._poll_handle = None
+
+    @callback
+    def _async_handle_poll(self) -> None:
+        """Run the poll that is due."""
+        self._poll_handle = None
+        if self.hass.is_stopping:
+            return
+        self.config_entry.async_create_background_task(
+            self.hass, self.async_refresh(), f"{self.name} poll"
         )
 
+    async def async_shutdown(self) -> None:
+        """Stop polling and shut down the coordinator."""
+        self._polling = False
+        self._async_cancel_poll()
+        await super().async_shutdown()
+
+    def _schedule_next_poll(self, data: HealthboxDataObject) -> None:
+        """Adapt the poll interval to what the Healthbox is doing."""
+        changes = self.changes
+        if any(room.boost is not None and room.boost.enabled for room in data.rooms.values()):
+            self._set_poll_interval(SCAN_INTERVAL, POLL_REASON_BOOST)
+        elif changes.rooms or changes.added_rooms or changes.removed_rooms:
+            self._set_poll_interval(SCAN_INTERVAL, POLL_REASON_CHANGING)
+        else:
+            self._back_off(POLL_REASON_STABLE)
+
+    async def _async_after_command(self) -> None:
+        """Snap back to fast polling and refresh after a command."""
+        self._set_poll_interval(SCAN_INTERVAL, POLL_REASON_COMMAND)
+        await self.async_request_refresh()
+
+    async def async_run_room_commands(
+        self,
+        room_ids: Iterable[int],
+        command: Callable[[int], Awaitable[None]],
+    ) -> None:
+        """Run a command for several rooms concurrently, then refresh once."""
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_COMMANDS)
+
+        async def _run(room_id: int) -> None:
+            async with semaphore:
+                await command(room_id)
+
+        try:
+            await asyncio.gather(*(_run(room_id) for room_id in room_ids))
+        finally:
+            await self._async_after_command()
+
+    @callback
+    def _apply_optimistic(
+        self, room_id: int, values: dict[str, object], expected: dict[str, object]
+    ) -> None:
+        """Apply commanded values to the snapshot and push them to the room entities."""
+        if self.data is None or (room := self.data.rooms.get(room_id)) is None:
+            return
+
+        for name, value in values.items():
+            setattr(room, name, value)
+        self._pending.setdefault(room_id, HealthboxPendingCommand()).update(
+            values, expected, monotonic()
+        )
+        # Merge: a poll may be between computing its changes and fanning them out.
+        self.changes.rooms.setdefault(room_id, set()).update(values)
+        self.async_update_listeners()
+
+    def _reconcile_optimistic(
+        self, data: HealthboxDataObject, fetch_started: float
+    ) -> None:
+        """Check commanded values against the polled data.
+
+        A poll that started before a command finished may not include it yet,
+        so the commanded values are put back and checked on the next poll.
+        Otherwise the poll has already overwritten the optimistic values, so a
+        mismatch only needs to be reported; the change set carries the rollback
+        to the entities.
+        """
+        pending: dict[int, HealthboxPendingCommand] = {}
+        for room_id, command in self._pending.items():
+            if (room := data.rooms.get(room_id)) is None:
+                continue
+            if command.finished >= fetch_started:
+                for name, value in command.values.items():
+                    setattr(room, name, value)
+                pending[room_id] = command
+                continue
+            for path, value in command.expected.items():
+                if (actual := attrgetter(path)(room)) != value:
+                    LOGGER.warning(
+                        "Room %s reports %s=%s instead of the commanded %s, rolling back",
+                        room_id,
+                        path,
+                        actual,
+                        value,
+                    )
+        self._pending = pending
+
     async def change_room_profile(
         self, room_id: int, profile_name: str
     ):
@@ -57,6 +594,12 @@ class HealthboxDataUpdateCoordinator(DataUpdateCoordinator):
         await self.api.async_change_room_profile(
             room_id=room_id, profile_name=profile_name
         )
+        profile_name = profile_name.capitalize()
+        self._apply_optimistic(
+            room_id,
+            {"profile_name": profile_name},
+            {"profile_name": profile_name},
+        )
 
     async def start_room_boost(
         self, room_id: int, boost_level: int, boost_timeout: int
@@ -65,17 +608,221 @@ class HealthboxDataUpdateCoordinator(DataUpdateCoordinator):
         await self.api.async_start_room_boost(
             room_id=room_id, boost_level=boost_level, boost_timeout=boost_timeout
         )
+        self._apply_optimistic(
+            room_id,
+            {
+                "boost": HealthboxRoomBoost(
+                    level=boost_level, enabled=True, remaining=boost_timeout
+                )
+            },
+            {"boost.enabled": True, "boost.level": boost_level},
+        )
 
     async def stop_room_boost(self, room_id: int):
         """Stop Boosting HB Room."""
         await self.api.async_stop_room_boost(room_id=room_id)
+        room = self.get_room(room_id) if self.data is not None else None
+        level = room.boost.level if room is not None and room.boost else None
+        self._apply_optimistic(
+            room_id,
+            {"boost": HealthboxRoomBoost(level=level, enabled=False, remaining=0)},
+            {"boost.enabled": False},
+        )
+
+    def get_room(self, room_id: int) -> HealthboxRoom | None:
+        """Return the HB Room with the given id from the last refresh."""
+        return self.data.rooms.get(room_id)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners and time the fan-out."""
+        start = perf_counter()
+        super().async_update_listeners()
+        self.stats.fan_out.record(perf_counter() - start)
+        self.statistics.async_flush()
+
+    async def _async_request_optional(self, endpoint: str) -> Any | None:
+        """Request an endpoint whose data may be missing from a refresh."""
+        try:
+            return await self.api.request(endpoint=endpoint)
+        except Healthbox3ApiClientAuthenticationError:
+            raise
+        except Healthbox3ApiClientError as exception:
+            LOGGER.debug("Unable to fetch %s from %s: %s", endpoint, self.host, exception)
+            return None
+
+    async def _async_request_raw(self, endpoint: str) -> bytes:
+        """Request an endpoint and return the undecoded body.
+
+        Healthbox3.request only returns decoded JSON, so this mirrors its error
+        handling for the requests the coordinator decodes itself.
+        """
+        try:
+            async with self.session.get(f"http://{self.host}{endpoint}") as response:
+                if response.status in (401, 403):
+                    raise Healthbox3ApiClientAuthenticationError("Invalid credentials")
+                response.raise_for_status()
+                return await response.read()
+        except asyncio.TimeoutError as exception:
+            raise Healthbox3ApiClientCommunicationError(
+                "Timeout occurred while connecting to the Healthbox device"
+            ) from exception
+        except ClientError as exception:
+            raise Healthbox3ApiClientError(
+                "Error occurred while communicating with the Healthbox device"
+            ) from exception
 
-    async def _async_update_data(self):
-        """Update data via library."""
+    async def _async_fetch_live(
+        self, projection: frozenset[str] | None
+    ) -> tuple[int, dict[str, Any], dict[int, HealthboxRoomBoost], dict[str, object]]:
+        """Fetch the fast tier: room readings, room boosts and the fan status."""
+        raw = await self._async_request_raw(ENDPOINT_CURRENT_DATA)
         try:
-            await self.api.async_get_data()
+            # The snapshot is built straight from the decoded payload.
+            payload: dict[str, Any] = json_loads(raw)
+        except ValueError as exception:
+            raise Healthbox3ApiClientError(
+                f"Invalid current data from the Healthbox device: {exception}"
+            ) from exception
+        boosts: dict[int, HealthboxRoomBoost] = {}
+        for key in payload["room"]:
+            boost = await self.api.async_get_room_boost_data(room_id=key)
+            boosts[int(key)] = HealthboxRoomBoost.from_api(boost)
+
+        fields: dict[str, object] = {}
+        if (projection is None or PROJECTION_FAN in projection) and (
+            fan := await self._async_request_optional(ENDPOINT_FAN)
+        ) is not None:
+            fields["fan"] = HealthboxFan.from_api(fan)
+        return len(raw), payload, boosts, fields
+
+    async def _async_fetch_metadata(self) -> dict[str, object]:
+        """Fetch the slow tier: error count, firmware version and WiFi status."""
+        fields: dict[str, object] = {}
+        if (errors := await self._async_request_optional(ENDPOINT_ERRORS)) is not None:
+            fields["error_count"] = len(errors)
+        if (
+            core := await self._async_request_optional(ENDPOINT_GLOBAL_CORE)
+        ) is not None and "firmware version" in core:
+            fields["firmware_version"] = core["firmware version"]
+        if (wifi := await self._async_request_optional(ENDPOINT_WIFI_STATUS)) is not None:
+            fields["wifi"] = HealthboxWifi.from_api(wifi)
+        return fields
+
+    async def async_refresh(self) -> None:
+        """Refresh data, or wait for the refresh already in flight.
+
+        The caller that started a refresh fans its result out to the
+        listeners, so joining callers do not update them a second time.
+        """
+        if (task := self._refresh_task) is not None:
+            await asyncio.wait((task,))
+            return
+        await super().async_refresh()
+
+    async def _async_update_data(self) -> HealthboxDataObject:
+        """Update data, sharing the refresh that is already in flight if any."""
+        if self._refresh_task is None:
+            if (
+                self._next_poll_at is not None
+                and (lateness := self.hass.loop.time() - self._next_poll_at) >= 0
+            ):
+                # Requested refreshes run before the slot and are not late.
+                self.stats.lateness.record(lateness)
+            self._next_poll_at = None
+            self._refresh_task = self.hass.async_create_task(
+                self._async_fetch_data(), f"{self.name} refresh"
+            )
+            self._refresh_task.add_done_callback(self._async_refresh_done)
+        poll_again = True
+        try:
+            # A cancelled caller must not cancel the refresh the other callers wait on.
+            return await asyncio.shield(self._refresh_task)
+        except ConfigEntryAuthFailed:
+            # Like DataUpdateCoordinator, stop polling until the entry is reauthenticated.
+            poll_again = False
+            raise
+        finally:
+            if poll_again:
+                self._async_schedule_poll()
+            else:
+                # Also drop the poll a previous refresh scheduled.
+                self._async_cancel_poll()
+
+    @callback
+    def _async_refresh_done(self, task: asyncio.Task[HealthboxDataObject]) -> None:
+        """Allow the next refresh to start once the shared one finished."""
+        if self._refresh_task is task:
+            self._refresh_task = None
+        if not task.cancelled():
+            # Mark the error as retrieved in case every waiter was cancelled.
+            task.exception()
+
+    async def _async_fetch_data(self) -> HealthboxDataObject:
+        """Fetch the Healthbox and patch the snapshot."""
+        projection = self.projection
+        refresh_metadata = (
+            self._metadata_refreshed is None
+            or monotonic() - self._metadata_refreshed
+            >= METADATA_SCAN_INTERVAL.total_seconds()
+        )
+        if self.breaker.probe():
+            self._async_notify_state()
+        try:
+            async with self.scheduler.semaphore:
+                start = perf_counter()
+                fetch_started = monotonic()
+                payload_size, payload, boosts, fields = await self._async_fetch_live(
+                    projection
+                )
+                if refresh_metadata and (
+                    metadata := await self._async_fetch_metadata()
+                ):
+                    fields |= metadata
+                    self._metadata_refreshed = monotonic()
 
         except Healthbox3ApiClientAuthenticationError as exception:
+            self.stats.record_failure(exception)
+            self._async_notify_state()
             raise ConfigEntryAuthFailed(exception) from exception
         except Healthbox3ApiClientError as exception:
+            self.stats.record_failure(exception)
+            self._trip_breaker()
+            self._async_notify_state()
             raise UpdateFailed(exception) from exception
+
+        self.stats.request.record(perf_counter() - start)
+        if self._advanced_api_ready is not None:
+            # Build the snapshot with the advanced features the device ends up with.
+            await self._advanced_api_ready.wait()
+
+        parse_start = perf_counter()
+        self.stats.payload_size = payload_size
+        self.stats.success_count += 1
+
+        data = self.data
+        advanced_api_enabled = self.api.advanced_api_enabled
+        if data is None:
+            data = HealthboxDataObject.from_api(payload, boosts, advanced_api_enabled)
+            self.changes = HealthboxChangeSet(added_rooms=set(data.rooms))
+        else:
+            self.changes = data.update_from_api(
+                payload, boosts, advanced_api_enabled, projection
+            )
+            if self.changes.removed_rooms:
+                self._async_remove_rooms(self.changes.removed_rooms)
+        data.update_fields(fields, self.changes)
+        timestamp = dt_util.utcnow().timestamp()
+        self.telemetry.record(data, timestamp, projection)
+        self._reconcile_optimistic(data, fetch_started)
+        if self.breaker.record_success():
+            LOGGER.info("Healthbox %s is reachable again", self.host)
+            self._set_poll_interval(SCAN_INTERVAL, POLL_REASON_RECOVERED)
+        else:
+            self._schedule_next_poll(data)
+        # After scheduling: the derived values move on every poll, readings may not.
+        self.derived.update(data, timestamp, self.changes, projection)
+        self.stats.parse.record(perf_counter() - parse_start)
+        await self._async_sync_topology(data)
+        self._async_schedule_save()
+        return data
@@ -0,0 +1,38 @@
+"""Diagnostics support for healthbox."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import HealthboxDataUpdateCoordinator
+
+TO_REDACT = {CONF_API_KEY, "serial", "warranty_number", "ssid", "unique_id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: HealthboxDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "poll": {
+            "interval": coordinator.poll_interval.total_seconds(),
+            "fleet_size": coordinator.scheduler.size,
+            "fleet_phase": coordinator.scheduler.phase(entry.entry_id),
+            "reason": coordinator.poll_reason,
+            "last_update_success": coordinator.last_update_success,
+        },
+        "circuit_breaker": coordinator.breaker.as_dict(),
+        "refresh": coordinator.stats.as_dict(),
+        "data": async_redact_data(asdict(coordinator.data), TO_REDACT)
+        if coordinator.data is not None
+        else None,
+    }
@@ -0,0 +1,204 @@
+"""Base entity for healthbox."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo, EntityDescription
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER, ROOM_DEVICE_MODEL, HealthboxRoom
+from .coordinator import HealthboxDataUpdateCoordinator
+from .statistics import HealthboxAggregate, HealthboxStatisticsWindow
+
+
+def value_changed(previous: Any, current: Any, deadband: float = 0) -> bool:
+    """Return whether a value moved enough to be written to the state machine."""
+    if previous is None or current is None:
+        return previous is not current
+    if (
+        deadband
+        and isinstance(previous, int | float)
+        and isinstance(current, int | float)
+        and not isinstance(current, bool)
+    ):
+        return abs(current - previous) >= deadband
+    return current != previous
+
+
+@callback
+def async_track_new_rooms(
+    coordinator: HealthboxDataUpdateCoordinator,
+    entry: ConfigEntry,
+    add_rooms: Callable[[list[HealthboxRoom]], None],
+) -> None:
+    """Call add_rooms with the rooms that appear on the Healthbox after setup."""
+    known_rooms: set[int] = set(coordinator.data.rooms)
+
+    @callback
+    def _async_check_rooms() -> None:
+        changes = coordinator.changes
+        known_rooms.difference_update(changes.removed_rooms)
+        if not (added := changes.added_rooms - known_rooms):
+            return
+        known_rooms.update(added)
+        add_rooms(
+            [coordinator.data.rooms[room_id] for room_id in sorted(added)]
+        )
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_check_rooms))
+
+
+class HealthboxEntity(CoordinatorEntity[HealthboxDataUpdateCoordinator], ABC):
+    """Healthbox entity that only writes its state when its value changed."""
+
+    _deadband: float = 0
+    _last_value: Any = None
+    _last_available: bool | None = None
+    # Set to write one mean per window instead of every changed value.
+    _aggregate: HealthboxStatisticsWindow | None = None
+    _aggregated_fetch: int | None = None
+
+    @abstractmethod
+    def _compute_value(self) -> Any:
+        """Compute the current value from the coordinator data."""
+
+    @abstractmethod
+    def _set_value(self, value: Any) -> None:
+        """Store the value on the entity."""
+
+    def _is_affected(self) -> bool:
+        """Return whether the last refresh touched the data of this entity."""
+        return True
+
+    @callback
+    def _async_aggregated(self, aggregate: HealthboxAggregate) -> None:
+        """Handle the aggregate of a finished window."""
+
+    @callback
+    def _store_value(self, available: bool, value: Any) -> None:
+        """Remember and apply the value that is written to the state machine."""
+        self._last_available = available
+        self._last_value = value
+        self._set_value(value)
+
+    async def async_added_to_hass(self) -> None:
+        """Register the readings used and compute the initial value."""
+        await super().async_added_to_hass()
+        if reads := getattr(self.entity_description, "reads", ()):
+            self.async_on_remove(self.coordinator.async_project(reads))
+        available = self.available
+        self._store_value(available, self._compute_value() if available else None)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if availability or the value changed."""
+        if self._aggregate is not None:
+            self._handle_aggregated_update()
+            return
+
+        available = self.available
+        if available == self._last_available and (
+            not available or not self._is_affected()
+        ):
+            return
+
+        value = self._compute_value() if available else None
+        if available == self._last_available and not value_changed(
+            self._last_value, value, self._deadband
+        ):
+            return
+
+        self._store_value(available, value)
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_aggregated_update(self) -> None:
+        """Write the mean of the value once per window, or when availability changed.
+
+        A value is added at most once per fetch and only when the fetch changed
+        it; other updates let the last value hold and close a window that ended.
+        """
+        available = self.available
+        finished = None
+        if available:
+            timestamp = dt_util.utcnow().timestamp()
+            fetch = self.coordinator.stats.success_count
+            if (
+                fetch != self._aggregated_fetch
+                and self._is_affected()
+                and (value := self._compute_value()) is not None
+            ):
+                finished = self._aggregate.add_value(timestamp, float(value))
+            else:
+                finished = self._aggregate.advance(timestamp)
+            self._aggregated_fetch = fetch
+        if finished is not None:
+            self._async_aggregated(finished)
+            value = round(finished.mean, 2)
+        elif available == self._last_available:
+            return
+        else:
+            value = self._compute_value() if available else None
+
+        self._store_value(available, value)
+        self.async_write_ha_state()
+
+
+class HealthboxRoomEntity(HealthboxEntity):
+    """Healthbox entity that belongs to a Healthbox Room device."""
+
+    def __init__(
+        self,
+        coordinator: HealthboxDataUpdateCoordinator,
+        description: EntityDescription,
+        room: HealthboxRoom,
+    ) -> None:
+        """Initialize the room entity."""
+        super().__init__(coordinator)
+
+        self.entity_description = description
+        self._room_id: int = room.room_id
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}-{room.room_id}-{description.key}"
+        self._attr_name = f"{description.name}"
+        self._attr_device_info = DeviceInfo(
+            name=room.name,
+            identifiers={
+                (
+                    DOMAIN,
+                    f"{coordinator.config_entry.unique_id}_{room.room_id}",
+                )
+            },
+            manufacturer="Renson",
+            model=ROOM_DEVICE_MODEL,
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Skip rooms that were removed; their entities are removed with the device."""
+        if self._room_id in self.coordinator.changes.removed_rooms:
+            return
+        super()._handle_coordinator_update()
+
+    def _is_affected(self) -> bool:
+        """Return whether the last refresh changed the room fields this entity reads."""
+        changes = self.coordinator.changes
+        if self._room_id in changes.added_rooms:
+            return True
+        if (changed := changes.rooms.get(self._room_id)) is None:
+            return False
+        return not changed.isdisjoint(self.entity_description.fields)
+
+    def _get_room(self) -> HealthboxRoom | None:
+        """Return the room of this entity from the coordinator data."""
+        room = self.coordinator.get_room(self._room_id)
+
+        if room is None:
+            error_msg: str = f"No matching room found for id {self._room_id}"
+            LOGGER.error(error_msg)
+
+        return room
@@ -0,0 +1,57 @@
+"""Fleet-wide poll scheduling for healthbox."""
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_FLEET_SCHEDULER, FLEET_MAX_IN_FLIGHT, SCAN_INTERVAL
+
+
+class HealthboxFleetScheduler:
+    """Spread the polls of all Healthboxes evenly over the poll interval."""
+
+    def __init__(self) -> None:
+        """Initialize an empty fleet."""
+        self.semaphore = asyncio.Semaphore(FLEET_MAX_IN_FLIGHT)
+        self._entry_ids: list[str] = []
+
+    @property
+    def size(self) -> int:
+        """Return the number of Healthboxes in the fleet."""
+        return len(self._entry_ids)
+
+    @callback
+    def async_add(self, entry_id: str) -> None:
+        """Give a config entry a poll slot."""
+        if entry_id not in self._entry_ids:
+            self._entry_ids.append(entry_id)
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Free the poll slot of a config entry; the other slots move up."""
+        if entry_id in self._entry_ids:
+            self._entry_ids.remove(entry_id)
+
+    def phase(self, entry_id: str) -> float:
+        """Return the offset in seconds of a config entry within the poll interval."""
+        if entry_id not in self._entry_ids:
+            return 0
+        return (
+            self._entry_ids.index(entry_id)
+            * SCAN_INTERVAL.total_seconds()
+            / len(self._entry_ids)
+        )
+
+    def next_slot(self, entry_id: str, earliest: float) -> float:
+        """Return the first loop time from earliest on that falls in the entry's slot."""
+        period = SCAN_INTERVAL.total_seconds()
+        return earliest + (self.phase(entry_id) - earliest) % period
+
+
+@callback
+def async_get_fleet_scheduler(hass: HomeAssistant) -> HealthboxFleetScheduler:
+    """Return the scheduler shared by all Healthbox entries."""
+    if DATA_FLEET_SCHEDULER not in hass.data:
+        hass.data[DATA_FLEET_SCHEDULER] = HealthboxFleetScheduler()
+    return hass.data[DATA_FLEET_SCHEDULER]
@@ -2,28 +2,32 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.util import slugify
 
 from homeassistant.const import (
     UnitOfTemperature,
     PERCENTAGE,
     CONCENTRATION_PARTS_PER_MILLION,
     REVOLUTIONS_PER_MINUTE,
+    UnitOfEnergy,
     UnitOfPower,
     UnitOfPressure,
     UnitOfVolumeFlowRate,
     UnitOfElectricPotential,
+    UnitOfInformation,
     UnitOfTime
 )
 
 
+from homeassistant.components.recorder.models import StatisticMetaData
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorEntityDescription,
@@ -32,8 +36,23 @@ from homeassistant.components.sensor import (
 )
 
 
-from .const import DOMAIN, MANUFACTURER, HealthboxRoom, LOGGER
+from .const import (
+    BREAKER_STATES,
+    CONF_CO2_DEADBAND,
+    CONF_EXTERNAL_STATISTICS,
+    CONF_HUMIDITY_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND,
+    DEFAULT_DEADBAND,
+    DERIVED_MEAN_WINDOWS,
+    DOMAIN,
+    MANUFACTURER,
+    PROJECTION_FAN,
+    STATISTICS_WINDOW,
+    HealthboxRoom,
+)
 from .coordinator import HealthboxDataUpdateCoordinator
+from .entity import HealthboxEntity, HealthboxRoomEntity, async_track_new_rooms
+from .statistics import HealthboxAggregate, HealthboxStatisticsWindow
 
 
 @dataclass
@@ -41,24 +60,41 @@ class HealthboxGlobalEntityDescriptionMixin:
     """Mixin values for Healthbox Global entities."""
 
     value_fn: Callable[[], float | int | str | Decimal | None]
+    high_rate: bool = False
+    reads: tuple[str, ...] = ()
+    # Snapshot fields read by value_fn; a change to any of them updates the entity.
+    fields: tuple[str, ...] = ()
 
 
-@dataclass
+# Keyword-only: the mixin fields with defaults precede the required key.
+@dataclass(kw_only=True)
 class HealthboxGlobalSensorEntityDescription(
     SensorEntityDescription, HealthboxGlobalEntityDescriptionMixin
 ):
     """Class describing Healthbox Global sensor entities."""
 
 
+@dataclass(kw_only=True)
+class HealthboxCoordinatorSensorEntityDescription(
+    SensorEntityDescription, HealthboxGlobalEntityDescriptionMixin
+):
+    """Class describing Healthbox coordinator diagnostic sensor entities."""
+
+
 @dataclass
 class HealthboxRoomEntityDescriptionMixin:
     """Mixin values for Healthbox Room entities."""
 
     room: HealthboxRoom
     value_fn: Callable[[], float | int | str | Decimal | None]
+    deadband_key: str | None = None
+    high_rate: bool = False
+    reads: tuple[str, ...] = ()
+    # Room fields read by value_fn; a change to any of them updates the entity.
+    fields: tuple[str, ...] = ()
 
 
-@dataclass
+@dataclass(kw_only=True)
 class HealthboxRoomSensorEntityDescription(
     SensorEntityDescription, HealthboxRoomEntityDescriptionMixin
 ):
@@ -67,11 +103,13 @@ class HealthboxRoomSensorEntityDescription(
 
 def generate_room_sensors_for_healthbox(
     coordinator: HealthboxDataUpdateCoordinator,
+    rooms: Iterable[HealthboxRoom] | None = None,
 ) -> list[HealthboxRoomSensorEntityDescription]:
-    """Generate sensors for each room."""
+    """Generate sensors for each room, or for the given rooms only."""
     room_sensors: list[HealthboxRoomSensorEntityDescription] = []
-    if coordinator.api.advanced_api_enabled:
-        for room in coordinator.api.rooms:
+    rooms = list(coordinator.data.rooms.values() if rooms is None else rooms)
+    if coordinator.data.advanced_api_enabled:
+        for room in rooms:
             if "indoor temperature" in room.enabled_sensors:
                 room_sensors.append(
                     HealthboxRoomSensorEntityDescription(
@@ -83,6 +121,10 @@ def generate_room_sensors_for_healthbox(
                         state_class=SensorStateClass.MEASUREMENT,
                         room=room,
                         value_fn=lambda x: x.indoor_temperature,
+                        fields=("indoor_temperature",),
+                        reads=("indoor temperature",),
+                        high_rate=True,
+                        deadband_key=CONF_TEMPERATURE_DEADBAND,
                         suggested_display_precision=2,
                     ),
                 )
@@ -97,6 +139,10 @@ def generate_room_sensors_for_healthbox(
                         state_class=SensorStateClass.MEASUREMENT,
                         room=room,
                         value_fn=lambda x: x.indoor_humidity,
+                        fields=("indoor_humidity",),
+                        reads=("indoor relative humidity",),
+                        high_rate=True,
+                        deadband_key=CONF_HUMIDITY_DEADBAND,
                         suggested_display_precision=2,
                     ),
                 )
@@ -112,6 +158,10 @@ def generate_room_sensors_for_healthbox(
                             state_class=SensorStateClass.MEASUREMENT,
                             room=room,
                             value_fn=lambda x: x.indoor_co2_concentration,
+                            fields=("indoor_co2_concentration",),
+                            reads=("indoor CO2",),
+                            high_rate=True,
+                            deadband_key=CONF_CO2_DEADBAND,
                             suggested_display_precision=2,
                         ),
                     )
@@ -127,6 +177,9 @@ def generate_room_sensors_for_healthbox(
                             state_class=SensorStateClass.MEASUREMENT,
                             room=room,
                             value_fn=lambda x: x.indoor_aqi,
+                            fields=("indoor_aqi",),
+                            reads=("indoor air quality index",),
+                            high_rate=True,
                             suggested_display_precision=2,
                         ),
                     )
@@ -141,12 +194,72 @@ def generate_room_sensors_for_healthbox(
                             device_class=SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS_PARTS,
                             state_class=SensorStateClass.MEASUREMENT,
                             room=room,
+                            entity_registry_enabled_default=False,
                             value_fn=lambda x: x.indoor_voc_ppm,
+                            fields=("indoor_voc_ppm",),
+                            reads=("indoor volatile organic compounds",),
+                            high_rate=True,
                             suggested_display_precision=2,
                         ),
                     )
+            for metric, sensor_type, name, unit, device_class, icon in (
+                (
+                    "co2",
+                    "indoor CO2",
+                    "CO2",
+                    CONCENTRATION_PARTS_PER_MILLION,
+                    SensorDeviceClass.CO2,
+                    "mdi:molecule-co2",
+                ),
+                (
+                    "humidity",
+                    "indoor relative humidity",
+                    "Humidity",
+                    PERCENTAGE,
+                    SensorDeviceClass.HUMIDITY,
+                    "mdi:water-percent",
+                ),
+            ):
+                if sensor_type not in room.enabled_sensors:
+                    continue
+                room_sensors.append(
+                    HealthboxRoomSensorEntityDescription(
+                        key=f"{room.room_id}_{metric}_rate",
+                        name=f"{room.name} {name} Rate of Change",
+                        native_unit_of_measurement=f"{unit}/min",
+                        icon="mdi:chart-line-variant",
+                        state_class=SensorStateClass.MEASUREMENT,
+                        room=room,
+                        value_fn=lambda x, key=f"{metric}_rate": x.derived.get(key),
+                        fields=("derived",),
+                        reads=(sensor_type,),
+                        high_rate=True,
+                        suggested_display_precision=2,
+                    ),
+                )
+                for window in DERIVED_MEAN_WINDOWS:
+                    room_sensors.append(
+                        HealthboxRoomSensorEntityDescription(
+                            key=f"{room.room_id}_{metric}_mean_{window}m",
+                            name=f"{room.name} {name} {window} min Mean",
+                            native_unit_of_measurement=unit,
+                            icon=icon,
+                            device_class=device_class,
+                            state_class=SensorStateClass.MEASUREMENT,
+                            room=room,
+                            entity_registry_enabled_default=window
+                            == DERIVED_MEAN_WINDOWS[0],
+                            value_fn=lambda x, key=f"{metric}_mean_{window}m": (
+                                x.derived.get(key)
+                            ),
+                            fields=("derived",),
+                            reads=(sensor_type,),
+                            high_rate=True,
+                            suggested_display_precision=1,
+                        ),
+                    )
 
-    for room in coordinator.api.rooms:
+    for room in rooms:
         if room.boost is not None:
             room_sensors.append(
                 HealthboxRoomSensorEntityDescription(
@@ -158,6 +271,7 @@ def generate_room_sensors_for_healthbox(
                     state_class=SensorStateClass.MEASUREMENT,
                     room=room,
                     value_fn=lambda x: x.boost.level,
+                    fields=("boost",),
                     suggested_display_precision=2,
                 ),
             )
@@ -169,7 +283,9 @@ def generate_room_sensors_for_healthbox(
                     icon="mdi:clock-time-five-outline",
                     state_class=SensorStateClass.MEASUREMENT,
                     room=room,
-                    value_fn=lambda x: x.boost.remaining
+                    entity_registry_enabled_default=False,
+                    value_fn=lambda x: x.boost.remaining,
+                    fields=("boost",),
                 ),
             )
         if room.airflow_ventilation_rate is not None:
@@ -183,6 +299,8 @@ def generate_room_sensors_for_healthbox(
                     state_class=SensorStateClass.MEASUREMENT,
                     room=room,
                     value_fn=lambda x: x.airflow_ventilation_rate * 100,
+                    fields=("airflow_ventilation_rate",),
+                    high_rate=True,
                     suggested_display_precision=2,
                 ),
             )
@@ -194,6 +312,7 @@ def generate_room_sensors_for_healthbox(
                     icon="mdi:account-box",
                     room=room,
                     value_fn=lambda x: x.profile_name,
+                    fields=("profile_name",),
                 ),
             )
     return room_sensors
@@ -213,6 +332,8 @@ def generate_global_sensors_for_healthbox(
             device_class=SensorDeviceClass.AQI,
             state_class=SensorStateClass.MEASUREMENT,
             value_fn=lambda x: x.global_aqi,
+            fields=("global_aqi",),
+            high_rate=True,
             suggested_display_precision=2,
         )
     )
@@ -223,20 +344,26 @@ def generate_global_sensors_for_healthbox(
             native_unit_of_measurement=None,
             icon="mdi:alert-outline",
             state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
             value_fn=lambda x: x.error_count,
+            fields=("error_count",),
             suggested_display_precision=0,
         )
     )
-    if coordinator.api.wifi.status:
+    if coordinator.data.wifi.status:
         global_sensors.append(
             HealthboxGlobalSensorEntityDescription(
                 key="wifi_status",
                 name="WiFi Status",
                 icon="mdi:wifi",
+                entity_category=EntityCategory.DIAGNOSTIC,
+                entity_registry_enabled_default=False,
                 value_fn=lambda x: x.wifi.status,
+                fields=("wifi",),
             )
         )
-    if coordinator.api.wifi.internet_connection is not None:
+    if coordinator.data.wifi.internet_connection is not None:
         global_sensors.append(
             HealthboxGlobalSensorEntityDescription(
                 key="wifi_internet_connection",
@@ -244,20 +371,26 @@ def generate_global_sensors_for_healthbox(
                 native_unit_of_measurement=None,
                 icon="mdi:web",
                 state_class=SensorStateClass.MEASUREMENT,
+                entity_category=EntityCategory.DIAGNOSTIC,
+                entity_registry_enabled_default=False,
                 value_fn=lambda x: x.wifi.internet_connection,
+                fields=("wifi",),
             )
         )
-    if coordinator.api.wifi.ssid:
+    if coordinator.data.wifi.ssid:
         global_sensors.append(
             HealthboxGlobalSensorEntityDescription(
                 key="wifi_ssid",
                 name="WiFi SSID",
                 icon="mdi:wifi-settings",
+                entity_category=EntityCategory.DIAGNOSTIC,
+                entity_registry_enabled_default=False,
                 value_fn=lambda x: x.wifi.ssid,
+                fields=("wifi",),
             )
         )
 
-    if coordinator.api.fan.voltage is not None:
+    if coordinator.data.fan.voltage is not None:
         global_sensors.append(
             HealthboxGlobalSensorEntityDescription(
                 key="fan_voltage",
@@ -266,11 +399,15 @@ def generate_global_sensors_for_healthbox(
                 native_unit_of_measurement=UnitOfElectricPotential.VOLT,
                 device_class=SensorDeviceClass.VOLTAGE,
                 state_class=SensorStateClass.MEASUREMENT,
+                entity_category=EntityCategory.DIAGNOSTIC,
+                entity_registry_enabled_default=False,
                 value_fn=lambda x: x.fan.voltage,
+                fields=("fan",),
+                reads=(PROJECTION_FAN,),
                 suggested_display_precision=2,
             )
         )
-    if coordinator.api.fan.pressure is not None:
+    if coordinator.data.fan.pressure is not None:
         global_sensors.append(
             HealthboxGlobalSensorEntityDescription(
                 key="fan_pressure",
@@ -279,11 +416,15 @@ def generate_global_sensors_for_healthbox(
                 native_unit_of_measurement=UnitOfPressure.PA,
                 device_class=SensorDeviceClass.PRESSURE,
                 state_class=SensorStateClass.MEASUREMENT,
+                entity_registry_enabled_default=False,
                 value_fn=lambda x: x.fan.pressure,
+                fields=("fan",),
+                reads=(PROJECTION_FAN,),
+                high_rate=True,
                 suggested_display_precision=2,
             )
         )
-    if coordinator.api.fan.flow is not None:
+    if coordinator.data.fan.flow is not None:
         global_sensors.append(
             HealthboxGlobalSensorEntityDescription(
                 key="fan_flow",
@@ -292,11 +433,15 @@ def generate_global_sensors_for_healthbox(
                 native_unit_of_measurement=UnitOfVolumeFlowRate.CUBIC_METERS_PER_HOUR,
                 device_class=SensorDeviceClass.VOLUME_FLOW_RATE,
                 state_class=SensorStateClass.MEASUREMENT,
+                entity_registry_enabled_default=False,
                 value_fn=lambda x: x.fan.flow,
+                fields=("fan",),
+                reads=(PROJECTION_FAN,),
+                high_rate=True,
                 suggested_display_precision=2,
             )
         )
-    if coordinator.api.fan.power is not None:
+    if coordinator.data.fan.power is not None:
         global_sensors.append(
             HealthboxGlobalSensorEntityDescription(
                 key="fan_power",
@@ -306,10 +451,27 @@ def generate_global_sensors_for_healthbox(
                 device_class=SensorDeviceClass.POWER,
                 state_class=SensorStateClass.MEASUREMENT,
                 value_fn=lambda x: x.fan.power,
+                fields=("fan",),
+                reads=(PROJECTION_FAN,),
+                high_rate=True,
                 suggested_display_precision=2,
             )
         )
-    if coordinator.api.fan.rpm is not None:
+        global_sensors.append(
+            HealthboxGlobalSensorEntityDescription(
+                key="fan_energy",
+                name="Fan Energy",
+                icon="mdi:lightning-bolt",
+                native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+                device_class=SensorDeviceClass.ENERGY,
+                state_class=SensorStateClass.TOTAL_INCREASING,
+                value_fn=lambda x: x.fan_energy,
+                fields=("fan_energy",),
+                reads=(PROJECTION_FAN,),
+                suggested_display_precision=3,
+            )
+        )
+    if coordinator.data.fan.rpm is not None:
         global_sensors.append(
             HealthboxGlobalSensorEntityDescription(
                 key="fan_rpm",
@@ -317,13 +479,136 @@ def generate_global_sensors_for_healthbox(
                 icon="mdi:fan",
                 native_unit_of_measurement=REVOLUTIONS_PER_MINUTE,
                 state_class=SensorStateClass.MEASUREMENT,
+                entity_registry_enabled_default=False,
                 value_fn=lambda x: x.fan.rpm,
+                fields=("fan",),
+                reads=(PROJECTION_FAN,),
+                high_rate=True,
             )
         )
 
     return global_sensors
 
 
+def generate_coordinator_sensors_for_healthbox(
+    coordinator: HealthboxDataUpdateCoordinator,
+) -> list[HealthboxCoordinatorSensorEntityDescription]:
+    """Generate diagnostic sensors describing the coordinator."""
+    coordinator_sensors: list[HealthboxCoordinatorSensorEntityDescription] = []
+    coordinator_sensors.append(
+        HealthboxCoordinatorSensorEntityDescription(
+            key="poll_interval",
+            name="Poll Interval",
+            icon="mdi:timer-sync-outline",
+            native_unit_of_measurement=UnitOfTime.SECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            value_fn=lambda x: x.poll_interval.total_seconds(),
+        )
+    )
+    coordinator_sensors.append(
+        HealthboxCoordinatorSensorEntityDescription(
+            key="poll_reason",
+            name="Poll Reason",
+            icon="mdi:timer-cog-outline",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            value_fn=lambda x: x.poll_reason,
+        )
+    )
+    coordinator_sensors.append(
+        HealthboxCoordinatorSensorEntityDescription(
+            key="circuit_breaker",
+            name="Circuit Breaker",
+            icon="mdi:electric-switch",
+            device_class=SensorDeviceClass.ENUM,
+            options=BREAKER_STATES,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            value_fn=lambda x: x.breaker.state,
+        )
+    )
+    for key, name in (
+        ("request", "Refresh Request Time"),
+        ("parse", "Refresh Parse Time"),
+        ("fan_out", "Refresh Fan-out Time"),
+    ):
+        coordinator_sensors.append(
+            HealthboxCoordinatorSensorEntityDescription(
+                key=f"refresh_{key}_time",
+                name=name,
+                icon="mdi:timer-outline",
+                native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+                device_class=SensorDeviceClass.DURATION,
+                state_class=SensorStateClass.MEASUREMENT,
+                entity_category=EntityCategory.DIAGNOSTIC,
+                entity_registry_enabled_default=False,
+                value_fn=lambda x, key=key: None
+                if (last := getattr(x.stats, key).last) is None
+                else round(last * 1000, 1),
+            )
+        )
+    coordinator_sensors.append(
+        HealthboxCoordinatorSensorEntityDescription(
+            key="poll_lateness",
+            name="Poll Lateness",
+            icon="mdi:timer-alert-outline",
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda x: None
+            if (last := x.stats.lateness.last) is None
+            else round(last * 1000, 1),
+        )
+    )
+    coordinator_sensors.append(
+        HealthboxCoordinatorSensorEntityDescription(
+            key="refresh_payload_size",
+            name="Refresh Payload Size",
+            icon="mdi:file-download-outline",
+            native_unit_of_measurement=UnitOfInformation.BYTES,
+            device_class=SensorDeviceClass.DATA_SIZE,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda x: x.stats.payload_size,
+        )
+    )
+    coordinator_sensors.append(
+        HealthboxCoordinatorSensorEntityDescription(
+            key="refresh_success_count",
+            name="Refresh Successes",
+            icon="mdi:check-circle-outline",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda x: x.stats.success_count,
+        )
+    )
+    coordinator_sensors.append(
+        HealthboxCoordinatorSensorEntityDescription(
+            key="refresh_failure_count",
+            name="Refresh Failures",
+            icon="mdi:alert-circle-outline",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda x: x.stats.failure_count,
+        )
+    )
+    coordinator_sensors.append(
+        HealthboxCoordinatorSensorEntityDescription(
+            key="refresh_last_error",
+            name="Refresh Last Error",
+            icon="mdi:alert-outline",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+            value_fn=lambda x: x.stats.last_error,
+        )
+    )
+    return coordinator_sensors
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -337,19 +622,65 @@ async def async_setup_entry(
     global_sensors = generate_global_sensors_for_healthbox(
         coordinator=coordinator)
     room_sensors = generate_room_sensors_for_healthbox(coordinator=coordinator)
+    coordinator_sensors = generate_coordinator_sensors_for_healthbox(
+        coordinator=coordinator)
     entities = []
 
     for description in global_sensors:
         entities.append(HealthboxGlobalSensor(coordinator, description))
+    for description in coordinator_sensors:
+        entities.append(HealthboxCoordinatorSensor(coordinator, description))
     for description in room_sensors:
         entities.append(HealthboxRoomSensor(coordinator, description))
 
     async_add_entities(entities)
 
+    @callback
+    def _async_add_rooms(rooms: list[HealthboxRoom]) -> None:
+        """Add the sensors of rooms that appeared after setup."""
+        async_add_entities(
+            HealthboxRoomSensor(coordinator, description)
+            for description in generate_room_sensors_for_healthbox(
+                coordinator=coordinator, rooms=rooms
+            )
+        )
+
+    async_track_new_rooms(coordinator, config_entry, _async_add_rooms)
 
-class HealthboxGlobalSensor(
-    CoordinatorEntity[HealthboxDataUpdateCoordinator], SensorEntity
-):
+
+class HealthboxExternalStatisticsMixin(HealthboxEntity, SensorEntity):
+    """Sensor that can hand its long-term statistics to the coordinator."""
+
+    _statistic_metadata: StatisticMetaData | None = None
+
+    def _setup_external_statistics(self, high_rate: bool) -> None:
+        """Aggregate a high-rate sensor when external statistics are enabled."""
+        if not high_rate or not self.coordinator.config_entry.options.get(
+            CONF_EXTERNAL_STATISTICS, False
+        ):
+            return
+
+        self._aggregate = HealthboxStatisticsWindow(
+            STATISTICS_WINDOW.total_seconds()
+        )
+        # The imported statistics replace the ones compiled from the states.
+        self._attr_state_class = None
+        self._statistic_metadata = StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=self._attr_name,
+            source=DOMAIN,
+            statistic_id=f"{DOMAIN}:{slugify(self._attr_unique_id)}",
+            unit_of_measurement=self.entity_description.native_unit_of_measurement,
+        )
+
+    @callback
+    def _async_aggregated(self, aggregate: HealthboxAggregate) -> None:
+        """Pass the aggregate of a finished window on to the statistics import."""
+        self.coordinator.statistics.add(self._statistic_metadata, aggregate)
+
+
+class HealthboxGlobalSensor(HealthboxExternalStatisticsMixin):
     """Representation of a Healthbox  Room Sensor."""
 
     entity_description: HealthboxGlobalSensorEntityDescription
@@ -363,27 +694,63 @@ class HealthboxGlobalSensor(
         super().__init__(coordinator)
 
         self.entity_description = description
-        self._attr_unique_id = f"{
-            coordinator.config_entry.entry_id}-{description.key}"
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}-{description.key}"
         self._attr_name = f"Healthbox {description.name}"
         self._attr_device_info = DeviceInfo(
-            name=f"{coordinator.api.serial}",
+            name=f"{coordinator.data.serial}",
             identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
             manufacturer=MANUFACTURER,
-            model=coordinator.api.description,
-            hw_version=coordinator.api.warranty_number,
-            sw_version=coordinator.api.firmware_version,
+            model=coordinator.data.description,
+            hw_version=coordinator.data.warranty_number,
+            sw_version=coordinator.data.firmware_version,
+        )
+        self._setup_external_statistics(description.high_rate)
+
+    def _is_affected(self) -> bool:
+        """Return whether the last refresh changed the fields this sensor reads."""
+        changed = self.coordinator.changes.fields
+        return not changed.isdisjoint(self.entity_description.fields)
+
+    def _compute_value(self) -> float | int | str | Decimal | None:
+        """Sensor native value."""
+        return self.entity_description.value_fn(self.coordinator.data)
+
+    def _set_value(self, value: float | int | str | Decimal | None) -> None:
+        """Set the sensor native value."""
+        self._attr_native_value = value
+
+
+class HealthboxCoordinatorSensor(HealthboxGlobalSensor):
+    """Representation of a Healthbox coordinator diagnostic sensor."""
+
+    entity_description: HealthboxCoordinatorSensorEntityDescription
+
+    async def async_added_to_hass(self) -> None:
+        """Also follow the coordinator state when refreshes keep failing."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self.coordinator.state_signal,
+                self._handle_coordinator_update,
+            )
         )
 
     @property
-    def native_value(self) -> float | int | str | Decimal:
+    def available(self) -> bool:
+        """Coordinator diagnostics stay available when a refresh fails."""
+        return True
+
+    def _is_affected(self) -> bool:
+        """Coordinator diagnostics change on every refresh."""
+        return True
+
+    def _compute_value(self) -> float | int | str | None:
         """Sensor native value."""
-        return self.entity_description.value_fn(self.coordinator.api)
+        return self.entity_description.value_fn(self.coordinator)
 
 
-class HealthboxRoomSensor(
-    CoordinatorEntity[HealthboxDataUpdateCoordinator], SensorEntity
-):
+class HealthboxRoomSensor(HealthboxRoomEntity, HealthboxExternalStatisticsMixin):
     """Representation of a Healthbox Room Sensor."""
 
     entity_description: HealthboxRoomSensorEntityDescription
@@ -394,39 +761,21 @@ class HealthboxRoomSensor(
         description: HealthboxRoomSensorEntityDescription,
     ) -> None:
         """Initialize Sensor Domain."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, description, description.room)
 
-        self.entity_description = description
-        self._attr_unique_id = f"{
-            coordinator.config_entry.entry_id}-{description.room.room_id}-{description.key}"
-        self._attr_name = f"{description.name}"
-        self._attr_device_info = DeviceInfo(
-            name=self.entity_description.room.name,
-            identifiers={
-                (
-                    DOMAIN,
-                    f"{coordinator.config_entry.unique_id}_{
-                        self.entity_description.room.room_id}",
-                )
-            },
-            manufacturer="Renson",
-            model="Healthbox Room",
-        )
+        if description.deadband_key is not None:
+            self._deadband = coordinator.config_entry.options.get(
+                description.deadband_key, DEFAULT_DEADBAND
+            )
+        self._setup_external_statistics(description.high_rate)
 
-    @property
-    def native_value(self) -> float | int | str | Decimal:
+    def _compute_value(self) -> float | int | str | Decimal | None:
         """Sensor native value."""
-        room_id: int = int(self.entity_description.room.room_id)
-
-        matching_room = [
-            room for room in self.coordinator.api.rooms if int(room.room_id) == room_id
-        ]
+        if (room := self._get_room()) is None:
+            return None
 
-        if len(matching_room) != 1:
-            error_msg: str = f"No matching room found for id {room_id}"
-            LOGGER.error(error_msg)
-        else:
-            matching_room = matching_room[0]
-            return self.entity_description.value_fn(matching_room)
+        return self.entity_description.value_fn(room)
 
-        return None
+    def _set_value(self, value: float | int | str | Decimal | None) -> None:
+        """Set the sensor native value."""
+        self._attr_native_value = value
@@ -0,0 +1,254 @@
+"""Service helpers for healthbox."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_AREA_ID, ATTR_DEVICE_ID
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+
+from .const import (
+    DATA_DEVICE_RESOLVER,
+    DOMAIN,
+    SERVICE_CHANGE_ROOM_PROFILE,
+    SERVICE_CHANGE_ROOM_PROFILE_SCHEMA,
+    SERVICE_DUMP_TELEMETRY,
+    SERVICE_DUMP_TELEMETRY_SCHEMA,
+    SERVICE_START_ROOM_BOOST,
+    SERVICE_START_ROOM_BOOST_SCHEMA,
+    SERVICE_STOP_ROOM_BOOST,
+    SERVICE_STOP_ROOM_BOOST_SCHEMA,
+)
+from .coordinator import HealthboxDataUpdateCoordinator
+from .telemetry import is_metric_recorded
+
+RoomCommand = Callable[[HealthboxDataUpdateCoordinator, int], Awaitable[None]]
+
+
+def _room_id_from_device(device: dr.DeviceEntry, entry: ConfigEntry) -> int | None:
+    """Return the HB Room id of a device belonging to the given entry."""
+    prefix = f"{entry.unique_id}_"
+    for domain, identifier in device.identifiers:
+        if domain == DOMAIN and identifier.startswith(prefix):
+            try:
+                return int(identifier[len(prefix):])
+            except ValueError:
+                return None
+    return None
+
+
+class HealthboxDeviceResolver:
+    """Map Healthbox Room device ids to their config entry and room id."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the resolver and follow device registry updates."""
+        self.hass = hass
+        self._rooms: dict[str, tuple[str, int]] = {}
+        # The services, and so the resolver, live as long as Home Assistant runs.
+        hass.bus.async_listen(
+            dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_registry_updated
+        )
+
+    @callback
+    def async_add_entry(self, entry: ConfigEntry) -> None:
+        """Index the room devices of a config entry."""
+        device_registry = dr.async_get(self.hass)
+        for device in dr.async_entries_for_config_entry(
+            device_registry, entry.entry_id
+        ):
+            if (room_id := _room_id_from_device(device, entry)) is not None:
+                self._rooms[device.id] = (entry.entry_id, room_id)
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> None:
+        """Forget the room devices of a config entry."""
+        self._rooms = {
+            device_id: target
+            for device_id, target in self._rooms.items()
+            if target[0] != entry_id
+        }
+
+    @callback
+    def async_resolve(self, device_id: str) -> tuple[str, int] | None:
+        """Return the config entry id and room id for a device id."""
+        if (target := self._rooms.get(device_id)) is not None:
+            return target
+
+        device = dr.async_get(self.hass).async_get(device_id)
+        if device is None:
+            return None
+        for entry_id in device.config_entries:
+            entry = self.hass.config_entries.async_get_entry(entry_id)
+            if entry is None or entry.domain != DOMAIN:
+                continue
+            if (room_id := _room_id_from_device(device, entry)) is not None:
+                self._rooms[device_id] = (entry_id, room_id)
+                return self._rooms[device_id]
+        return None
+
+    @callback
+    def _async_device_registry_updated(
+        self, event: Event[dr.EventDeviceRegistryUpdatedData]
+    ) -> None:
+        """Drop a cached device when it changes; it is resolved again on use."""
+        self._rooms.pop(event.data["device_id"], None)
+
+
+@callback
+def async_resolve_call_targets(
+    hass: HomeAssistant, call: ServiceCall
+) -> dict[str, set[int]]:
+    """Resolve the targeted devices and areas to HB Room ids per config entry."""
+    resolver: HealthboxDeviceResolver = hass.data[DATA_DEVICE_RESOLVER]
+    device_ids: set[str] = set(call.data.get(ATTR_DEVICE_ID, []))
+    if area_ids := call.data.get(ATTR_AREA_ID):
+        device_registry = dr.async_get(hass)
+        for area_id in area_ids:
+            device_ids.update(
+                device.id
+                for device in dr.async_entries_for_area(device_registry, area_id)
+            )
+
+    targets: dict[str, set[int]] = {}
+    for device_id in device_ids:
+        if (target := resolver.async_resolve(device_id)) is not None:
+            entry_id, room_id = target
+            targets.setdefault(entry_id, set()).add(room_id)
+    return targets
+
+
+async def _async_dispatch(
+    hass: HomeAssistant, call: ServiceCall, command: RoomCommand
+) -> None:
+    """Run a room command as one batch per targeted Healthbox."""
+    coordinators: dict[str, HealthboxDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+    targets = {
+        entry_id: room_ids
+        for entry_id, room_ids in async_resolve_call_targets(hass, call).items()
+        if entry_id in coordinators
+    }
+    if not targets:
+        raise ServiceValidationError("No loaded Healthbox 3 room is targeted")
+    await asyncio.gather(
+        *(
+            coordinators[entry_id].async_run_room_commands(
+                room_ids,
+                lambda room_id, box=coordinators[entry_id]: command(box, room_id),
+            )
+            for entry_id, room_ids in targets.items()
+        )
+    )
+
+
+@callback
+def _async_resolve_telemetry_target(
+    hass: HomeAssistant, device_id: str
+) -> tuple[HealthboxDataUpdateCoordinator, int | None] | None:
+    """Return the coordinator and room id, or None for the Healthbox itself."""
+    coordinators: dict[str, HealthboxDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+    resolver: HealthboxDeviceResolver = hass.data[DATA_DEVICE_RESOLVER]
+    if (target := resolver.async_resolve(device_id)) is not None:
+        entry_id, room_id = target
+        if entry_id in coordinators:
+            return coordinators[entry_id], room_id
+        return None
+
+    if (device := dr.async_get(hass).async_get(device_id)) is None:
+        return None
+    for domain, identifier in device.identifiers:
+        if domain == DOMAIN and identifier in coordinators:
+            return coordinators[identifier], None
+    return None
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Healthbox services for all config entries."""
+    hass.data[DATA_DEVICE_RESOLVER] = HealthboxDeviceResolver(hass)
+
+    async def change_room_profile(call: ServiceCall) -> None:
+        """Service to change the HB3 Room Profile."""
+        profile_name = call.data["profile_name"]
+        await _async_dispatch(
+            hass,
+            call,
+            lambda box, room_id: box.change_room_profile(
+                room_id=room_id, profile_name=profile_name
+            ),
+        )
+
+    async def start_room_boost(call: ServiceCall) -> None:
+        """Service call to start boosting fans in a room."""
+        boost_level = call.data["boost_level"]
+        boost_timeout = call.data["boost_timeout"] * 60
+        await _async_dispatch(
+            hass,
+            call,
+            lambda box, room_id: box.start_room_boost(
+                room_id=room_id,
+                boost_level=boost_level,
+                boost_timeout=boost_timeout,
+            ),
+        )
+
+    async def stop_room_boost(call: ServiceCall) -> None:
+        """Service call to stop boosting fans in a room."""
+        await _async_dispatch(
+            hass,
+            call,
+            lambda box, room_id: box.stop_room_boost(room_id=room_id),
+        )
+
+    @callback
+    def dump_telemetry(call: ServiceCall) -> ServiceResponse:
+        """Service call to return the recent readings of Healthbox devices."""
+        devices: dict[str, Any] = {}
+        metric: str | None = call.data.get("metric")
+        for device_id in call.data[ATTR_DEVICE_ID]:
+            if (target := _async_resolve_telemetry_target(hass, device_id)) is None:
+                raise ServiceValidationError(
+                    f"Device {device_id} is not a loaded Healthbox device"
+                )
+            coordinator, room_id = target
+            if metric is not None and not is_metric_recorded(
+                coordinator.projection, metric
+            ):
+                raise ServiceValidationError(
+                    f"The {metric} readings are only kept while an entity showing "
+                    "them is enabled"
+                )
+            devices[device_id] = coordinator.telemetry.dump(
+                room_id, metric, call.data.get("samples")
+            )
+        return {"devices": devices}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_ROOM_BOOST,
+        start_room_boost,
+        SERVICE_START_ROOM_BOOST_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_ROOM_BOOST, stop_room_boost, SERVICE_STOP_ROOM_BOOST_SCHEMA
+    )
+    hass.services.async_register(DOMAIN, SERVICE_CHANGE_ROOM_PROFILE,
+                                 change_room_profile, SERVICE_CHANGE_ROOM_PROFILE_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_TELEMETRY,
+        dump_telemetry,
+        SERVICE_DUMP_TELEMETRY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
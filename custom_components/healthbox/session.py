@@ -0,0 +1,77 @@
+"""Pooled HTTP sessions for healthbox."""
+from __future__ import annotations
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+
+from .const import (
+    DATA_SESSION_POOL,
+    DOMAIN,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_MAX_CONNECTIONS_PER_HOST,
+    HTTP_TOTAL_TIMEOUT,
+)
+
+
+class HealthboxSessionPool:
+    """Keep one keep-alive HTTP session per Healthbox host while it is in use."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty pool that is closed when Home Assistant stops."""
+        self.hass = hass
+        self._sessions: dict[str, ClientSession] = {}
+        self._users: dict[str, int] = {}
+        # Config entries are not unloaded at shutdown, so they never release.
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_close)
+
+    @callback
+    def async_acquire(self, host: str) -> ClientSession:
+        """Return the session of a host, creating it for the first user."""
+        if (session := self._sessions.get(host)) is None or session.closed:
+            session = self._sessions[host] = ClientSession(
+                connector=TCPConnector(
+                    limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+                    keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                ),
+                timeout=ClientTimeout(
+                    total=HTTP_TOTAL_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT
+                ),
+                headers={"User-Agent": SERVER_SOFTWARE},
+            )
+            self._users[host] = 0
+        self._users[host] += 1
+        return session
+
+    @callback
+    def async_release(self, host: str) -> None:
+        """Drop a user of a host session and close it after the last one."""
+        if host not in self._users:
+            return
+        self._users[host] -= 1
+        if self._users[host] > 0:
+            return
+        del self._users[host]
+        session = self._sessions.pop(host)
+        self.hass.async_create_background_task(
+            session.close(), f"{DOMAIN} close session {host}"
+        )
+
+    async def _async_close(self, event: Event) -> None:
+        """Close all sessions when Home Assistant stops."""
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        self._users.clear()
+        for session in sessions:
+            await session.close()
+
+
+@callback
+def async_get_session_pool(hass: HomeAssistant) -> HealthboxSessionPool:
+    """Return the session pool shared by all Healthbox entries and flows."""
+    if DATA_SESSION_POOL not in hass.data:
+        hass.data[DATA_SESSION_POOL] = HealthboxSessionPool(hass)
+    return hass.data[DATA_SESSION_POOL]
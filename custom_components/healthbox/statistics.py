@@ -0,0 +1,149 @@
+"""External long-term statistics for healthbox."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import LOGGER
+
+
+@dataclass(slots=True)
+class HealthboxAggregate:
+    """Minimum, maximum and time-weighted mean of the values in a window."""
+
+    start: float
+    minimum: float
+    maximum: float
+    # Integral of the values over the seconds they held, like the ring buffer areas.
+    total: float = 0
+    duration: float = 0
+
+    @property
+    def mean(self) -> float:
+        """Return the time-weighted mean of the values."""
+        if not self.duration:
+            return self.minimum
+        return self.total / self.duration
+
+    def hold(self, value: float, seconds: float) -> None:
+        """Add a value that held for the given number of seconds."""
+        if seconds <= 0:
+            return
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.total += value * seconds
+        self.duration += seconds
+
+    def merge(self, other: HealthboxAggregate) -> None:
+        """Add the values of another aggregate."""
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.total += other.total
+        self.duration += other.duration
+
+
+class HealthboxStatisticsWindow:
+    """Aggregate values per fixed, clock-aligned window.
+
+    A value holds until the next one is added, so polls that come faster or
+    slower do not change the weight of a value in the mean.
+    """
+
+    __slots__ = ("length", "current", "_last")
+
+    def __init__(self, length: float) -> None:
+        """Initialize windows of the given length in seconds."""
+        self.length = length
+        self.current: HealthboxAggregate | None = None
+        self._last: tuple[float, float] | None = None
+
+    def add(self, aggregate: HealthboxAggregate) -> HealthboxAggregate | None:
+        """Add an aggregate and return the previous window once a new one starts."""
+        start = aggregate.start - aggregate.start % self.length
+        finished = None
+        if self.current is not None and self.current.start != start:
+            finished, self.current = self.current, None
+        if self.current is None:
+            self.current = HealthboxAggregate(
+                start=start, minimum=aggregate.minimum, maximum=aggregate.maximum
+            )
+        self.current.merge(aggregate)
+        return finished
+
+    def add_value(self, timestamp: float, value: float) -> HealthboxAggregate | None:
+        """Add a value and return the previous window once a new one starts."""
+        finished = None
+        start = timestamp - timestamp % self.length
+        if (current := self.current) is None:
+            current = self.current = HealthboxAggregate(
+                start=start, minimum=value, maximum=value
+            )
+        elif self._last is not None:
+            last_time, last_value = self._last
+            end = current.start + self.length
+            current.hold(last_value, min(timestamp, end) - last_time)
+            if timestamp >= end:
+                finished = current
+                current = self.current = HealthboxAggregate(
+                    start=start, minimum=value, maximum=value
+                )
+                # The previous value held from the start of this window.
+                current.hold(last_value, timestamp - start)
+        current.minimum = min(current.minimum, value)
+        current.maximum = max(current.maximum, value)
+        self._last = (timestamp, value)
+        return finished
+
+    def advance(self, timestamp: float) -> HealthboxAggregate | None:
+        """Let the last value hold until the timestamp and return a finished window."""
+        if self._last is None:
+            return None
+        return self.add_value(timestamp, self._last[1])
+
+
+class HealthboxStatisticsImporter:
+    """Import hourly statistics of aggregated sensors as external statistics.
+
+    The recorder only accepts imported statistics that start at the top of an
+    hour, so the 5 minute aggregates of the sensors are merged per hour.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize without statistics."""
+        self.hass = hass
+        self._metadata: dict[str, StatisticMetaData] = {}
+        self._hours: dict[str, HealthboxStatisticsWindow] = {}
+        self._pending: dict[str, list[StatisticData]] = {}
+
+    @callback
+    def add(self, metadata: StatisticMetaData, aggregate: HealthboxAggregate) -> None:
+        """Add the aggregate of a sensor; finished hours are queued for import."""
+        statistic_id = metadata["statistic_id"]
+        self._metadata[statistic_id] = metadata
+        if (hours := self._hours.get(statistic_id)) is None:
+            hours = self._hours[statistic_id] = HealthboxStatisticsWindow(3600)
+        if (hour := hours.add(aggregate)) is not None:
+            self._pending.setdefault(statistic_id, []).append(
+                StatisticData(
+                    start=dt_util.utc_from_timestamp(hour.start),
+                    mean=hour.mean,
+                    min=hour.minimum,
+                    max=hour.maximum,
+                )
+            )
+
+    @callback
+    def async_flush(self) -> None:
+        """Hand the finished hours to the recorder."""
+        if not self._pending or "recorder" not in self.hass.config.components:
+            return
+        pending, self._pending = self._pending, {}
+        for statistic_id, statistics in pending.items():
+            LOGGER.debug("Importing %s hours of %s", len(statistics), statistic_id)
+            async_add_external_statistics(
+                self.hass, self._metadata[statistic_id], statistics
+            )
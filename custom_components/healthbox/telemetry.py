@@ -0,0 +1,309 @@
+"""Recent telemetry of healthbox."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Collection
+from math import exp
+from typing import Any
+
+from .const import (
+    DERIVED_MAX_GAP,
+    DERIVED_MEAN_WINDOWS,
+    DERIVED_RATE_TIME_CONSTANT,
+    DERIVED_ROOM_METRICS,
+    FAN_TELEMETRY_METRICS,
+    FIELD_SENSOR_TYPES,
+    PROJECTION_FAN,
+    ROOM_TELEMETRY_METRICS,
+    TELEMETRY_CAPACITY,
+    HealthboxChangeSet,
+    HealthboxDataObject,
+)
+
+
+def is_projected(projection: Collection[str] | None, field_name: str) -> bool:
+    """Return whether a refresh with the given projection reads a room field."""
+    if projection is None:
+        return True
+    sensor_type = FIELD_SENSOR_TYPES.get(field_name)
+    return sensor_type is None or sensor_type in projection
+
+
+def is_metric_recorded(projection: Collection[str] | None, metric: str) -> bool:
+    """Return whether the telemetry records a metric under the given projection."""
+    if metric in FAN_TELEMETRY_METRICS:
+        return projection is None or PROJECTION_FAN in projection
+    return metric not in ROOM_TELEMETRY_METRICS or is_projected(
+        projection, ROOM_TELEMETRY_METRICS[metric]
+    )
+
+
+class HealthboxRingBuffer:
+    """Fixed-size ring buffer of timestamped samples with time-weighted means.
+
+    Each sample holds its value until the next one. Next to each sample the
+    area under those steps since the first sample is kept, so the mean over a
+    time window is a difference of two areas once its first sample is found.
+    The first sample of each window only moves forward with the newest one,
+    so it is kept per window instead of searched for.
+    """
+
+    __slots__ = ("capacity", "count", "_times", "_values", "_areas", "_starts")
+
+    def __init__(self, capacity: int = TELEMETRY_CAPACITY) -> None:
+        """Initialize an empty buffer."""
+        self.capacity = capacity
+        self.count: int = 0
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._areas = array("d", bytes(8 * capacity))
+        # Position of the first sample of each window, by window length.
+        self._starts: dict[float, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return min(self.count, self.capacity)
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        area = 0.0
+        if self.count:
+            last = (self.count - 1) % self.capacity
+            area = self._areas[last] + self._values[last] * (
+                timestamp - self._times[last]
+            )
+        index = self.count % self.capacity
+        self._times[index] = timestamp
+        self._values[index] = value
+        self._areas[index] = area
+        self.count += 1
+
+    def latest(self) -> tuple[float, float] | None:
+        """Return the timestamp and value of the newest sample."""
+        if not self.count:
+            return None
+        index = (self.count - 1) % self.capacity
+        return self._times[index], self._values[index]
+
+    def samples_since(self, timestamp: float) -> int:
+        """Return how many held samples are not older than a timestamp."""
+        low, high = self.count - len(self), self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._times[middle % self.capacity] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return self.count - low
+
+    def _window_start(self, seconds: float, start: float) -> int:
+        """Return the position of the first held sample not older than start.
+
+        The position is kept per window length and moved from where the last
+        call left it, which takes amortized constant time.
+        """
+        oldest = self.count - len(self)
+        position = max(self._starts.get(seconds, oldest), oldest)
+        while position < self.count and self._times[position % self.capacity] < start:
+            position += 1
+        # Only when the clock went back.
+        while (
+            position > oldest and self._times[(position - 1) % self.capacity] >= start
+        ):
+            position -= 1
+        self._starts[seconds] = position
+        return position
+
+    def time_weighted_mean(self, seconds: float) -> float | None:
+        """Return the time-weighted mean over the seconds up to the newest sample.
+
+        A sample weighs by how long it held, so the fast polls while a reading
+        changes do not outweigh the slow polls while it is stable. When the
+        buffer does not reach back that far, the mean covers what it holds.
+        """
+        if not self.count:
+            return None
+        newest = (self.count - 1) % self.capacity
+        end = self._times[newest]
+        start = end - seconds
+        position = self._window_start(seconds, start)
+        first = position % self.capacity
+        area = self._areas[newest] - self._areas[first]
+        if position > self.count - len(self):
+            # The sample before the window holds its value into it.
+            area += self._values[(position - 1) % self.capacity] * (
+                self._times[first] - start
+            )
+        else:
+            start = self._times[first]
+        if end <= start:
+            return self._values[newest]
+        return area / (end - start)
+
+    def as_dict(self, samples: int | None = None) -> dict[str, list[float]]:
+        """Return the last samples, oldest first."""
+        held = len(self) if samples is None else min(samples, len(self))
+        positions = range(self.count - held, self.count)
+        return {
+            "timestamps": [self._times[p % self.capacity] for p in positions],
+            "values": [self._values[p % self.capacity] for p in positions],
+        }
+
+
+class HealthboxTelemetry:
+    """Ring buffers of the numeric readings of one Healthbox."""
+
+    def __init__(self) -> None:
+        """Initialize without buffers; they are created on the first reading."""
+        self.rooms: dict[int, dict[str, HealthboxRingBuffer]] = {}
+        self.fan: dict[str, HealthboxRingBuffer] = {}
+
+    @staticmethod
+    def _append(
+        buffers: dict[str, HealthboxRingBuffer],
+        metric: str,
+        timestamp: float,
+        value: Any,
+    ) -> None:
+        """Append a reading, skipping readings the Healthbox did not report."""
+        if value is None:
+            return
+        if (buffer := buffers.get(metric)) is None:
+            buffer = buffers[metric] = HealthboxRingBuffer()
+        buffer.append(timestamp, float(value))
+
+    def record(
+        self,
+        data: HealthboxDataObject,
+        timestamp: float,
+        projection: Collection[str] | None = None,
+    ) -> None:
+        """Append the readings that were read by a refresh."""
+        metrics = {
+            metric: attribute
+            for metric, attribute in ROOM_TELEMETRY_METRICS.items()
+            if is_projected(projection, attribute)
+        }
+        for room_id, room in data.rooms.items():
+            buffers = self.rooms.setdefault(room_id, {})
+            for metric, attribute in metrics.items():
+                self._append(buffers, metric, timestamp, getattr(room, attribute))
+        if projection is None or PROJECTION_FAN in projection:
+            for metric, attribute in FAN_TELEMETRY_METRICS.items():
+                self._append(self.fan, metric, timestamp, getattr(data.fan, attribute))
+
+    def remove_room(self, room_id: int) -> None:
+        """Drop the buffers of a removed room."""
+        self.rooms.pop(room_id, None)
+
+    def get(self, room_id: int | None, metric: str) -> HealthboxRingBuffer | None:
+        """Return the buffer of a room metric, or of a fan metric for room None."""
+        buffers = self.fan if room_id is None else self.rooms.get(room_id, {})
+        return buffers.get(metric)
+
+    def dump(
+        self, room_id: int | None, metric: str | None = None, samples: int | None = None
+    ) -> dict[str, dict[str, list[float]]]:
+        """Return the buffers of a room, or of the fan for room None."""
+        buffers = self.fan if room_id is None else self.rooms.get(room_id, {})
+        return {
+            name: buffer.as_dict(samples)
+            for name, buffer in buffers.items()
+            if metric is None or name == metric
+        }
+
+
+class HealthboxRateOfChange:
+    """Exponentially smoothed rate of change per minute."""
+
+    __slots__ = ("rate", "_last")
+
+    def __init__(self) -> None:
+        """Initialize without samples."""
+        self.rate: float | None = None
+        self._last: tuple[float, float] | None = None
+
+    def add(self, timestamp: float, value: float) -> float | None:
+        """Add a sample and return the smoothed rate."""
+        last, self._last = self._last, (timestamp, value)
+        if last is None or (elapsed := timestamp - last[0]) <= 0:
+            return self.rate
+        rate = (value - last[1]) * 60 / elapsed
+        if self.rate is None:
+            self.rate = rate
+        else:
+            alpha = 1 - exp(-elapsed / DERIVED_RATE_TIME_CONSTANT.total_seconds())
+            self.rate += alpha * (rate - self.rate)
+        return self.rate
+
+
+class HealthboxDerivedCalculator:
+    """Compute the derived room readings and the fan energy of one Healthbox.
+
+    The room readings come from the telemetry buffers, which must have
+    recorded the refresh first.
+    """
+
+    def __init__(self, telemetry: HealthboxTelemetry) -> None:
+        """Initialize without state; it builds up from the refreshes."""
+        self.telemetry = telemetry
+        self._rates: dict[tuple[int, str], HealthboxRateOfChange] = {}
+        self._last_power: tuple[float, float] | None = None
+
+    def update(
+        self,
+        data: HealthboxDataObject,
+        timestamp: float,
+        changes: HealthboxChangeSet,
+        projection: Collection[str] | None = None,
+    ) -> None:
+        """Update the derived values of a refresh and record what changed."""
+        metrics = {
+            metric: attribute
+            for metric, attribute in DERIVED_ROOM_METRICS.items()
+            if is_projected(projection, attribute)
+        }
+        for room_id, room in data.rooms.items():
+            derived: dict[str, float | None] = {}
+            for metric, attribute in metrics.items():
+                if getattr(room, attribute) is None or (
+                    buffer := self.telemetry.get(room_id, metric)
+                ) is None:
+                    continue
+                if (rate := self._rates.get((room_id, metric))) is None:
+                    rate = self._rates[room_id, metric] = HealthboxRateOfChange()
+                if (current := rate.add(*buffer.latest())) is not None:
+                    derived[f"{metric}_rate"] = round(current, 2)
+                for window in DERIVED_MEAN_WINDOWS:
+                    derived[f"{metric}_mean_{window}m"] = round(
+                        buffer.time_weighted_mean(window * 60), 1
+                    )
+            if derived != room.derived:
+                room.derived = derived
+                changes.rooms.setdefault(room_id, set()).add("derived")
+
+        if projection is not None and PROJECTION_FAN not in projection:
+            # Do not integrate over the time the fan was not read.
+            self._last_power = None
+        elif (power := data.fan.power) is not None:
+            data.update_fields(
+                {"fan_energy": self._integrate_power(data, timestamp, float(power))},
+                changes,
+            )
+
+    def _integrate_power(
+        self, data: HealthboxDataObject, timestamp: float, power: float
+    ) -> float:
+        """Add the energy since the previous power sample with the trapezoidal rule."""
+        energy = data.fan_energy or 0
+        last, self._last_power = self._last_power, (timestamp, power)
+        if last is not None and 0 < (elapsed := timestamp - last[0]) <= (
+            DERIVED_MAX_GAP.total_seconds()
+        ):
+            # W * s to kWh
+            energy += (last[1] + power) / 2 * elapsed / 3_600_000
+        return round(energy, 6)
+
+    def remove_room(self, room_id: int) -> None:
+        """Drop the state of a removed room."""
+        self._rates = {key: rate for key, rate in self._rates.items() if key[0] != room_id}
@@ -0,0 +1 @@
+"""Tests for the Renson Healthbox integration."""
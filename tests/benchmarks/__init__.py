@@ -0,0 +1 @@
+"""Benchmarks for the Renson Healthbox integration."""
@@ -0,0 +1,116 @@
+"""Fixtures for the Renson Healthbox benchmarks."""
+from __future__ import annotations
+
+import asyncio
+import tracemalloc
+from collections.abc import Callable, Generator
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.healthbox.const import (
+    DOMAIN,
+    SENSOR_TYPE_FIELDS,
+    HealthboxChangeSet,
+)
+from custom_components.healthbox.coordinator import HealthboxDataUpdateCoordinator
+
+from ..conftest import SetupHealthbox
+from ..simulator import HealthboxSimulator
+
+
+class HealthboxFleet:
+    """Simulated Healthboxes set up in Home Assistant."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        setup_healthbox: SetupHealthbox,
+    ) -> None:
+        """Initialize an empty fleet."""
+        self.hass = hass
+        self._setup_healthbox = setup_healthbox
+        self.simulators: list[HealthboxSimulator] = []
+        self.coordinators: list[HealthboxDataUpdateCoordinator] = []
+        # Bytes allocated by setting up the entries and their entities.
+        self.setup_memory = 0
+
+    def run(self, coroutine_function: Callable[[], object]) -> object:
+        """Run a coroutine function on the Home Assistant loop."""
+        return self.hass.loop.run_until_complete(coroutine_function())
+
+    def setup(self, boxes: int, rooms: int = 3) -> None:
+        """Start the simulators and set up an entry for each of them."""
+
+        async def _setup() -> None:
+            for index in range(boxes):
+                simulator = HealthboxSimulator(rooms=rooms, serial=f"SIM{index:04}")
+                await simulator.start()
+                self.simulators.append(simulator)
+            tracemalloc.start()
+            try:
+                for simulator in self.simulators:
+                    entry = await self._setup_healthbox(simulator)
+                    self.coordinators.append(self.hass.data[DOMAIN][entry.entry_id])
+                self.setup_memory = tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+
+        self.run(_setup)
+
+    def refresh(self) -> None:
+        """Let the readings drift and refresh every Healthbox once."""
+
+        async def _refresh() -> None:
+            for simulator in self.simulators:
+                simulator.step()
+            await asyncio.gather(
+                *(coordinator.async_refresh() for coordinator in self.coordinators)
+            )
+            await self.hass.async_block_till_done()
+
+        self.run(_refresh)
+
+    def fan_out(self) -> None:
+        """Change every room reading and update the entities of every Healthbox."""
+        for coordinator in self.coordinators:
+            changed: dict[int, set[str]] = {}
+            for room_id, room in coordinator.data.rooms.items():
+                for name in SENSOR_TYPE_FIELDS.values():
+                    if (value := getattr(room, name)) is not None:
+                        setattr(room, name, value + 1)
+                        changed.setdefault(room_id, set()).add(name)
+            coordinator.changes = HealthboxChangeSet(rooms=changed)
+            coordinator.async_update_listeners()
+        self.run(self.hass.async_block_till_done)
+
+    def stop(self) -> None:
+        """Stop the simulators."""
+
+        async def _stop() -> None:
+            for simulator in self.simulators:
+                await simulator.stop()
+
+        self.run(_stop)
+
+
+@pytest.fixture(autouse=True)
+def enable_event_loop_debug() -> None:
+    """Keep the event loop out of debug mode, which slows every callback down."""
+
+
+@pytest.fixture
+def fleet(
+    hass: HomeAssistant,
+    socket_enabled: None,
+    setup_healthbox: SetupHealthbox,
+) -> Generator[HealthboxFleet, None, None]:
+    """Return an empty fleet of simulated Healthboxes.
+
+    The benchmarks are synchronous, so the fleet runs its coroutines on the
+    Home Assistant loop while it is idle between the benchmark rounds.
+    """
+    healthbox_fleet = HealthboxFleet(hass, setup_healthbox)
+    yield healthbox_fleet
+    healthbox_fleet.stop()
@@ -0,0 +1,46 @@
+"""Benchmarks of Home Assistant instances with several Healthboxes."""
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import callback
+
+from .conftest import HealthboxFleet
+
+FLEET_SIZES = [1, 10, 100]
+
+
+@pytest.mark.parametrize("boxes", FLEET_SIZES)
+def test_refresh_latency(benchmark, fleet: HealthboxFleet, boxes: int) -> None:
+    """Benchmark refreshing every Healthbox once while the readings drift."""
+    fleet.setup(boxes)
+    benchmark.extra_info["setup_memory_kib"] = round(fleet.setup_memory / 1024)
+    benchmark.extra_info["entities"] = len(fleet.hass.states.async_all())
+
+    benchmark(fleet.refresh)
+
+    assert all(coordinator.last_update_success for coordinator in fleet.coordinators)
+
+
+@pytest.mark.parametrize("boxes", FLEET_SIZES)
+def test_state_write_throughput(benchmark, fleet: HealthboxFleet, boxes: int) -> None:
+    """Benchmark the fan-out of a refresh in which every room reading changed."""
+    fleet.setup(boxes)
+    writes: list[str] = []
+
+    @callback
+    def _count_write(event) -> None:
+        writes.append(event.data["entity_id"])
+
+    unsub = fleet.hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+
+    def _fan_out() -> None:
+        writes.clear()
+        fleet.fan_out()
+
+    benchmark(_fan_out)
+    unsub()
+
+    benchmark.extra_info["state_writes_per_round"] = len(writes)
+    assert writes
@@ -0,0 +1,55 @@
+"""Benchmarks of parsing the current data with and without a projection."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from homeassistant.util.json import json_loads
+
+from custom_components.healthbox.const import HealthboxDataObject
+
+from ..simulator import HealthboxSimulator
+
+ROOM_COUNTS = [10, 100, 500]
+# The sensor types read by the entities enabled by default.
+DEFAULT_PROJECTION = frozenset(
+    {
+        "indoor temperature",
+        "indoor relative humidity",
+        "indoor CO2",
+        "indoor air quality index",
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "projection",
+    [None, DEFAULT_PROJECTION, frozenset({"indoor CO2"})],
+    ids=["full", "default", "co2"],
+)
+@pytest.mark.parametrize("rooms", ROOM_COUNTS)
+def test_parse_current_data(
+    benchmark, rooms: int, projection: frozenset[str] | None
+) -> None:
+    """Benchmark applying a payload in which every reading moved.
+
+    Decoding is left out: it takes the same time with every projection.
+    """
+    simulator = HealthboxSimulator(rooms=rooms)
+    data = HealthboxDataObject.from_api(simulator.current_data(), {}, True)
+    payloads = []
+    for _ in range(2):
+        simulator.step()
+        body = json.dumps(simulator.current_data()).encode()
+        payloads.append(json_loads(body))
+    benchmark.extra_info["payload_bytes"] = len(body)
+    rounds = iter(range(1_000_000_000))
+
+    def _parse() -> None:
+        # Alternate so that every round patches changed readings.
+        data.update_from_api(payloads[next(rounds) % 2], {}, True, projection)
+
+    benchmark(_parse)
+
+    assert len(data.rooms) == rooms
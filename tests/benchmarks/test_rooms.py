@@ -0,0 +1,18 @@
+"""Benchmarks of Healthboxes with many rooms."""
+from __future__ import annotations
+
+import pytest
+
+from .conftest import HealthboxFleet
+
+
+@pytest.mark.parametrize("rooms", [1, 10, 50])
+def test_room_entities_update(benchmark, fleet: HealthboxFleet, rooms: int) -> None:
+    """Benchmark the room entities looking up their room after a refresh.
+
+    The cost per room should stay flat as the number of rooms grows.
+    """
+    fleet.setup(1, rooms=rooms)
+    benchmark.extra_info["entities"] = len(fleet.hass.states.async_all())
+
+    benchmark(fleet.fan_out)
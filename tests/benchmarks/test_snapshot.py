@@ -0,0 +1,52 @@
+"""Benchmarks of the snapshot model against the pyhealthbox3 models."""
+from __future__ import annotations
+
+import gc
+import json
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from pyhealthbox3.models import Healthbox3DataObject
+
+from homeassistant.util.json import json_loads
+
+from custom_components.healthbox.const import HealthboxDataObject
+
+from ..simulator import HealthboxSimulator
+
+MODELS: dict[str, Callable[[dict[str, Any]], object]] = {
+    "snapshot": lambda payload: HealthboxDataObject.from_api(payload, {}, True),
+    "library": lambda payload: Healthbox3DataObject(payload, advanced_features=True),
+}
+
+
+def _retained_memory(body: bytes, build: Callable[[dict[str, Any]], object]) -> int:
+    """Return the bytes a model built from a payload keeps alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        model = build(json_loads(body))
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del model
+    return retained
+
+
+@pytest.mark.parametrize("model", list(MODELS))
+@pytest.mark.parametrize("rooms", [10, 100, 500])
+def test_snapshot_memory(benchmark, rooms: int, model: str) -> None:
+    """Benchmark building a model from a payload and record what it retains.
+
+    The library models keep the decoded payload of every room, the snapshot
+    only the values the platforms read.
+    """
+    body = json.dumps(HealthboxSimulator(rooms=rooms).current_data()).encode()
+    build = MODELS[model]
+    benchmark.extra_info["retained_bytes"] = _retained_memory(body, build)
+    benchmark.extra_info["payload_bytes"] = len(body)
+
+    benchmark(lambda: build(json_loads(body)))
@@ -0,0 +1,71 @@
+"""Fixtures for the Renson Healthbox tests."""
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_API_KEY, CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from custom_components.healthbox.const import DOMAIN
+
+from .simulator import API_KEY, HealthboxSimulator
+
+SetupHealthbox = Callable[..., Awaitable[MockConfigEntry]]
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components."""
+
+
+@pytest.fixture
+async def simulator(socket_enabled: None) -> AsyncGenerator[HealthboxSimulator, None]:
+    """Run a simulated Healthbox with three rooms on a local port."""
+    healthbox = HealthboxSimulator()
+    await healthbox.start()
+    yield healthbox
+    await healthbox.stop()
+
+
+@pytest.fixture
+async def setup_healthbox(
+    hass: HomeAssistant,
+) -> AsyncGenerator[SetupHealthbox, None]:
+    """Return a function that sets up a config entry for a simulated Healthbox.
+
+    The entries are unloaded after the test, which stops their polls.
+    """
+    entries: list[MockConfigEntry] = []
+
+    async def _setup(
+        healthbox: HealthboxSimulator,
+        api_key: str | None = API_KEY,
+        options: dict[str, Any] | None = None,
+    ) -> MockConfigEntry:
+        data = {CONF_HOST: healthbox.host}
+        if api_key is not None:
+            data[CONF_API_KEY] = api_key
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=healthbox.host,
+            unique_id=f"{DOMAIN}_{healthbox.host}",
+            data=data,
+            options=options or {},
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        entries.append(entry)
+        return entry
+
+    yield _setup
+
+    for entry in entries:
+        if entry.state is ConfigEntryState.LOADED:
+            await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
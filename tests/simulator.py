@@ -0,0 +1,291 @@
+"""Simulated Healthbox 3 serving its local REST API over HTTP."""
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+API_KEY = "simulated-api-key"
+
+# Sensor type, parameter name, unit and a typical reading.
+SENSOR_TEMPERATURE = ("indoor temperature", "temperature", "degC", 21.5)
+SENSOR_HUMIDITY = ("indoor relative humidity", "humidity", "pct", 48.0)
+SENSOR_CO2 = ("indoor CO2", "concentration", "ppm", 650.0)
+SENSOR_AQI = ("indoor air quality index", "index", "", 25.0)
+SENSOR_VOC = ("indoor volatile organic compounds", "concentration", "ppm", 180.0)
+
+# A living room with every sensor, a bathroom and a bedroom with the common ones.
+DEFAULT_SENSOR_MIXES = (
+    (SENSOR_TEMPERATURE, SENSOR_HUMIDITY, SENSOR_CO2, SENSOR_AQI, SENSOR_VOC),
+    (SENSOR_TEMPERATURE, SENSOR_HUMIDITY, SENSOR_AQI),
+    (SENSOR_TEMPERATURE, SENSOR_HUMIDITY, SENSOR_CO2, SENSOR_AQI),
+)
+
+
+@dataclass
+class SimulatedRoom:
+    """A room of the simulated Healthbox."""
+
+    name: str
+    room_type: str
+    sensors: tuple[tuple[str, str, str, float], ...]
+    readings: dict[str, float] = field(default_factory=dict)
+    profile_name: str = "health"
+    nominal: float = 100.0
+    flow_rate: float = 40.0
+    boost_level: float = 100
+    boost_enabled: bool = False
+    boost_remaining: int = 0
+
+    def __post_init__(self) -> None:
+        """Start every sensor at its typical reading."""
+        for sensor_type, _, _, value in self.sensors:
+            self.readings.setdefault(sensor_type, value)
+
+    def as_api(self) -> dict[str, Any]:
+        """Return the room as in the current data payload."""
+        return {
+            "name": self.name,
+            "type": self.room_type,
+            "profile_name": self.profile_name,
+            "sensor": [
+                {
+                    "basic_id": index,
+                    "name": f"{self.name} {sensor_type}",
+                    "type": sensor_type,
+                    "parameter": {
+                        parameter: {
+                            "unit": unit,
+                            "value": round(self.readings[sensor_type], 2),
+                        }
+                    },
+                }
+                for index, (sensor_type, parameter, unit, _) in enumerate(self.sensors)
+            ],
+            "parameter": {
+                "nominal": {"unit": "m3/h", "value": self.nominal},
+                "offset": {"unit": "m3/h", "value": 0},
+                "doors_open": {"unit": "", "value": False},
+            },
+            "actuator": [
+                {
+                    "basic_id": 0,
+                    "name": f"{self.name} valve",
+                    "type": "air valve",
+                    "parameter": {
+                        "flow_rate": {"unit": "m3/h", "value": self.flow_rate}
+                    },
+                }
+            ],
+        }
+
+
+class HealthboxSimulator:
+    """Serve realistic Healthbox 3 payloads on a local port.
+
+    The rooms, the latency and the errors can be changed while it runs, and
+    the requests it served are counted per path.
+    """
+
+    def __init__(
+        self,
+        rooms: int = 3,
+        sensor_mixes: tuple[tuple[tuple[str, str, str, float], ...], ...] = (
+            DEFAULT_SENSOR_MIXES
+        ),
+        latency: float = 0,
+        serial: str = "250424P0031",
+        firmware_version: str = "2.4.1",
+    ) -> None:
+        """Initialize a Healthbox with the given number of rooms."""
+        self.serial = serial
+        self.firmware_version = firmware_version
+        self.latency = latency
+        self.rooms: dict[int, SimulatedRoom] = {}
+        for room_id in range(1, rooms + 1):
+            self.add_room(room_id, sensor_mixes[(room_id - 1) % len(sensor_mixes)])
+        self.fan: dict[str, float] = {
+            "voltage": 5.3,
+            "pressure": 101.5,
+            "flow": 120.0,
+            "power": 18.2,
+            "rpm": 1450,
+        }
+        self.errors: list[dict[str, Any]] = []
+        self.api_key_valid = True
+        # HTTP status returned for every request, e.g. 401 or 503.
+        self.status: int | None = None
+        # HTTP status returned for single paths.
+        self.failures: dict[str, int] = {}
+        self.malformed = False
+        self.requests: Counter[str] = Counter()
+        # Size of the last current data body served.
+        self.served_bytes = 0
+        self.commands: list[tuple[str, Any]] = []
+        self._runner: web.AppRunner | None = None
+        self._random = random.Random(serial)
+
+    @property
+    def host(self) -> str:
+        """Return the host and port to configure the integration with."""
+        assert self._runner is not None, "The simulator is not running"
+        host, port = self._runner.addresses[0][:2]
+        return f"{host}:{port}"
+
+    def add_room(
+        self,
+        room_id: int,
+        sensors: tuple[tuple[str, str, str, float], ...] = DEFAULT_SENSOR_MIXES[0],
+    ) -> SimulatedRoom:
+        """Add a room with the given sensors."""
+        room = self.rooms[room_id] = SimulatedRoom(
+            name=f"Room {room_id}", room_type="BedRoom", sensors=sensors
+        )
+        return room
+
+    def step(self, spread: float = 1) -> None:
+        """Let every reading and the fan drift by up to the given spread."""
+        for room in self.rooms.values():
+            for sensor_type in room.readings:
+                room.readings[sensor_type] += self._random.uniform(-spread, spread)
+            room.flow_rate = max(0, room.flow_rate + self._random.uniform(-spread, spread))
+        self.fan["power"] = max(0, self.fan["power"] + self._random.uniform(-spread, spread))
+
+    def current_data(self) -> dict[str, Any]:
+        """Return the current data payload."""
+        return {
+            "device_type": "HEALTHBOX3",
+            "description": "Healthbox 3.0",
+            "serial": self.serial,
+            "warranty_number": f"W{self.serial}",
+            "global": {"parameter": {"device name": {"value": "Healthbox"}}},
+            "room": {
+                str(room_id): room.as_api() for room_id, room in self.rooms.items()
+            },
+            "sensor": [
+                {
+                    "basic_id": 0,
+                    "name": "global air quality index",
+                    "type": "global air quality index",
+                    "parameter": {
+                        "index": {"unit": "", "value": 30.0},
+                        "main_pollutant": {"unit": "", "value": "indoor CO2"},
+                    },
+                }
+            ],
+        }
+
+    def _room(self, request: web.Request) -> SimulatedRoom:
+        """Return the room addressed by a request."""
+        if (room := self.rooms.get(int(request.match_info["room_id"]))) is None:
+            raise web.HTTPNotFound
+        return room
+
+    async def _get_current_data(self, request: web.Request) -> web.Response:
+        """Serve the current data, or an undecodable body when malformed."""
+        body = '{"room": {' if self.malformed else json.dumps(self.current_data())
+        self.served_bytes = len(body.encode())
+        return web.Response(text=body, content_type="application/json")
+
+    async def _get_boost(self, request: web.Request) -> web.Response:
+        """Serve the boost of a room."""
+        room = self._room(request)
+        return web.json_response(
+            {
+                "level": room.boost_level,
+                "enable": room.boost_enabled,
+                "timeout": 900,
+                "remaining": room.boost_remaining,
+            }
+        )
+
+    async def _put_boost(self, request: web.Request) -> web.Response:
+        """Start or stop the boost of a room."""
+        room = self._room(request)
+        data = await request.json()
+        self.commands.append((request.path, data))
+        room.boost_enabled = data["enable"]
+        if room.boost_enabled:
+            room.boost_level = data["level"]
+            room.boost_remaining = data["timeout"]
+        else:
+            room.boost_remaining = 0
+        return web.json_response({})
+
+    async def _put_profile(self, request: web.Request) -> web.Response:
+        """Change the profile of a room."""
+        room = self._room(request)
+        room.profile_name = await request.json()
+        self.commands.append((request.path, room.profile_name))
+        return web.json_response({})
+
+    async def _post_api_key(self, request: web.Request) -> web.Response:
+        """Accept the simulated API key."""
+        self.api_key_valid = await request.json() == API_KEY
+        return web.Response(text="")
+
+    async def _get_api_key_status(self, request: web.Request) -> web.Response:
+        """Serve whether the advanced API is enabled."""
+        return web.json_response({"state": "valid" if self.api_key_valid else "invalid"})
+
+    async def _get_fan(self, request: web.Request) -> web.Response:
+        """Serve the fan status."""
+        return web.json_response(self.fan)
+
+    async def _get_errors(self, request: web.Request) -> web.Response:
+        """Serve the device errors."""
+        return web.json_response(self.errors)
+
+    async def _get_global_core(self, request: web.Request) -> web.Response:
+        """Serve the global core data with the firmware version."""
+        return web.json_response({"firmware version": self.firmware_version})
+
+    async def _get_wifi_status(self, request: web.Request) -> web.Response:
+        """Serve the WiFi client status."""
+        return web.json_response(
+            {"status": "connected", "internet_connection": "true", "ssid": "Home"}
+        )
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        """Count the request, wait for the latency and inject the errors."""
+        self.requests[request.path] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if (failure := self.failures.get(request.path, self.status)) is not None:
+            return web.Response(
+                status=failure,
+                text=json.dumps({"error": "injected"}),
+                content_type="application/json",
+            )
+        return await handler(request)
+
+    async def start(self) -> None:
+        """Start serving on a free local port."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/v2/api/data/current", self._get_current_data)
+        app.router.add_put(
+            "/v2/api/data/current/room/{room_id}/profile_name", self._put_profile
+        )
+        app.router.add_get("/v2/api/boost/{room_id}", self._get_boost)
+        app.router.add_put("/v2/api/boost/{room_id}", self._put_boost)
+        app.router.add_post("/v2/api/api_key", self._post_api_key)
+        app.router.add_get("/v2/api/api_key/status", self._get_api_key_status)
+        app.router.add_get("/v2/device/fan", self._get_fan)
+        app.router.add_get("/v2/device/error", self._get_errors)
+        app.router.add_get("/renson_core/v2/global", self._get_global_core)
+        app.router.add_get("/renson_core/v1/wifi/client/status", self._get_wifi_status)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,100 @@
+"""Tests for the Renson Healthbox data model."""
+from __future__ import annotations
+
+import pytest
+from pyhealthbox3.models import Healthbox3DataObject
+
+from custom_components.healthbox.const import (
+    SENSOR_TYPE_FIELDS,
+    HealthboxDataObject,
+    HealthboxRoomBoost,
+)
+
+from .simulator import HealthboxSimulator
+
+BOOSTS = {1: HealthboxRoomBoost(level=150, enabled=True, remaining=600)}
+
+
+@pytest.mark.parametrize("advanced", [True, False])
+def test_from_api_matches_the_library(advanced: bool) -> None:
+    """Test the snapshot reads the payload like the pyhealthbox3 models."""
+    payload = HealthboxSimulator().current_data()
+
+    data = HealthboxDataObject.from_api(payload, BOOSTS, advanced)
+    library = Healthbox3DataObject(payload, advanced_features=advanced)
+
+    assert data.serial == library.serial
+    assert data.warranty_number == library.warranty_number
+    assert data.global_aqi == library.global_aqi
+    assert data.advanced_api_enabled is advanced
+    # The library keeps the room ids as the payload keys.
+    assert set(data.rooms) == {int(room.room_id) for room in library.rooms}
+    for library_room in library.rooms:
+        room = data.rooms[int(library_room.room_id)]
+        assert room.name == library_room.name
+        assert room.room_type == library_room.room_type
+        assert list(room.enabled_sensors) == library_room.enabled_sensors
+        assert room.profile_name == library_room.profile_name
+        assert room.airflow_ventilation_rate == library_room.airflow_ventilation_rate
+        for name in SENSOR_TYPE_FIELDS.values():
+            assert getattr(room, name) == getattr(library_room, name), name
+    assert data.rooms[1].boost == BOOSTS[1]
+    assert data.rooms[2].boost is None
+
+
+def test_update_from_api_reports_the_changes() -> None:
+    """Test patching the snapshot records changed fields and rooms."""
+    simulator = HealthboxSimulator()
+    data = HealthboxDataObject.from_api(simulator.current_data(), {}, True)
+    room_1 = data.rooms[1]
+
+    assert not data.update_from_api(simulator.current_data(), {}, True)
+
+    simulator.rooms[1].readings["indoor CO2"] = 900
+    simulator.rooms[2].profile_name = "eco"
+    del simulator.rooms[3]
+    simulator.add_room(4)
+    changes = data.update_from_api(simulator.current_data(), BOOSTS, True)
+
+    assert changes.rooms == {
+        1: {"indoor_co2_concentration", "boost"},
+        2: {"profile_name"},
+    }
+    assert changes.added_rooms == {4}
+    assert changes.removed_rooms == {3}
+    assert not changes.fields
+    # Rooms are patched in place.
+    assert data.rooms[1] is room_1
+    assert room_1.indoor_co2_concentration == 900
+    assert data.rooms[2].profile_name == "Eco"
+    assert set(data.rooms) == {1, 2, 4}
+
+
+def test_update_from_api_with_projection_keeps_other_readings() -> None:
+    """Test a projected refresh only reads the projected sensor types."""
+    simulator = HealthboxSimulator()
+    data = HealthboxDataObject.from_api(simulator.current_data(), {}, True)
+
+    simulator.rooms[1].readings["indoor CO2"] = 900
+    simulator.rooms[1].readings["indoor temperature"] = 25
+    simulator.add_room(4)
+    changes = data.update_from_api(
+        simulator.current_data(), {}, True, frozenset({"indoor temperature"})
+    )
+
+    assert changes.rooms == {1: {"indoor_temperature"}}
+    assert data.rooms[1].indoor_temperature == 25
+    assert data.rooms[1].indoor_co2_concentration == 650
+    # New rooms are parsed in full for their entities.
+    assert data.rooms[4].indoor_co2_concentration == 650
+
+
+def test_stored_snapshot_round_trip() -> None:
+    """Test a snapshot is restored from its stored form."""
+    data = HealthboxDataObject.from_api(
+        HealthboxSimulator().current_data(), BOOSTS, True
+    )
+    data.fan_energy = 1.5
+    data.rooms[1].derived = {"co2_rate": 1.0}
+
+    assert HealthboxDataObject.from_dict(data.as_dict()) == data
@@ -0,0 +1,491 @@
+"""Tests for the Renson Healthbox coordinator."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from time import monotonic
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util import dt as dt_util
+
+from custom_components.healthbox.const import (
+    BREAKER_CLOSED,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_HALF_OPEN,
+    BREAKER_MAX_DELAY,
+    BREAKER_OPEN,
+    COMMAND_REFRESH_COOLDOWN,
+    DOMAIN,
+    ENDPOINT_CURRENT_DATA,
+    ENDPOINT_ERRORS,
+    ENDPOINT_GLOBAL_CORE,
+    ENDPOINT_WIFI_STATUS,
+    MAX_SCAN_INTERVAL,
+    METADATA_SCAN_INTERVAL,
+    POLL_REASON_BOOST,
+    POLL_REASON_CHANGING,
+    POLL_REASON_COMMAND,
+    POLL_REASON_ERROR,
+    POLL_REASON_STABLE,
+    SCAN_INTERVAL,
+    HealthboxDataObject,
+    HealthboxRoomBoost,
+)
+from custom_components.healthbox.coordinator import (
+    HealthboxCircuitBreaker,
+    HealthboxDataUpdateCoordinator,
+)
+
+from .conftest import SetupHealthbox
+from .simulator import HealthboxSimulator
+
+
+def test_breaker_opens_after_repeated_failures() -> None:
+    """Test the breaker opens at the threshold and backs off exponentially."""
+    breaker = HealthboxCircuitBreaker()
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        assert breaker.record_failure() is None
+    assert breaker.state == BREAKER_CLOSED
+    assert not breaker.probe()
+
+    first = breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert breaker.probe()
+    assert breaker.state == BREAKER_HALF_OPEN
+    assert not breaker.probe()
+    second = breaker.record_failure()
+    assert first is not None and second is not None
+    assert second.total_seconds() >= first.total_seconds()
+
+    for _ in range(20):
+        delay = breaker.record_failure()
+    assert delay <= BREAKER_MAX_DELAY
+
+    assert breaker.record_success()
+    assert breaker.as_dict() == {"state": BREAKER_CLOSED, "failures": 0, "trips": 0}
+    assert not breaker.record_success()
+
+
+async def _async_setup_coordinator(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> HealthboxDataUpdateCoordinator:
+    """Set up an entry and return its coordinator."""
+    entry = await setup_healthbox(simulator)
+    return hass.data[DOMAIN][entry.entry_id]
+
+
+async def test_refresh_patches_the_snapshot(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test a refresh patches the changed readings and schedules the next poll."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+    data = coordinator.data
+    assert coordinator._poll_handle is not None
+
+    simulator.rooms[2].readings["indoor relative humidity"] = 71
+    await coordinator.async_refresh()
+
+    assert coordinator.data is data
+    # The derived values move on every poll.
+    assert coordinator.changes.rooms == {
+        1: {"derived"},
+        2: {"indoor_humidity", "derived"},
+        3: {"derived"},
+    }
+    assert data.rooms[2].indoor_humidity == 71
+    assert coordinator.stats.payload_size == simulator.served_bytes
+    assert coordinator.stats.success_count == 2
+    assert coordinator.telemetry.dump(2, "humidity")["humidity"]["values"] == [48, 71]
+    assert coordinator._poll_handle is not None
+
+
+async def test_projection_skips_disabled_sensors(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test readings without an enabled entity are no longer parsed."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+
+    # The VOC sensor is disabled by default.
+    assert "indoor volatile organic compounds" not in coordinator.projection
+    assert "indoor CO2" in coordinator.projection
+
+    simulator.rooms[1].readings["indoor volatile organic compounds"] = 400
+    simulator.rooms[1].readings["indoor CO2"] = 1000
+    await coordinator.async_refresh()
+
+    assert coordinator.changes.rooms[1] == {"indoor_co2_concentration", "derived"}
+    assert coordinator.data.rooms[1].indoor_voc_ppm == 180
+
+
+async def test_metadata_is_fetched_less_often(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test the slow tier is only fetched once per metadata interval."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+    metadata = (ENDPOINT_ERRORS, ENDPOINT_GLOBAL_CORE, ENDPOINT_WIFI_STATUS)
+    assert [simulator.requests[endpoint] for endpoint in metadata] == [1, 1, 1]
+
+    simulator.errors.append({"error": "filter"})
+    await coordinator.async_refresh()
+
+    assert simulator.requests[ENDPOINT_CURRENT_DATA] == 2
+    assert [simulator.requests[endpoint] for endpoint in metadata] == [1, 1, 1]
+    assert coordinator.data.error_count == 0
+
+    coordinator._metadata_refreshed -= METADATA_SCAN_INTERVAL.total_seconds()
+    await coordinator.async_refresh()
+
+    assert [simulator.requests[endpoint] for endpoint in metadata] == [2, 2, 2]
+    assert coordinator.data.error_count == 1
+    assert "error_count" in coordinator.changes.fields
+
+
+async def test_poll_interval_follows_the_device(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test polling slows down while stable and speeds up on changes."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+    assert coordinator.poll_interval == SCAN_INTERVAL
+    assert coordinator.poll_reason == POLL_REASON_CHANGING
+
+    await coordinator.async_refresh()
+    assert coordinator.poll_interval == SCAN_INTERVAL * 2
+    assert coordinator.poll_reason == POLL_REASON_STABLE
+    for _ in range(5):
+        await coordinator.async_refresh()
+    assert coordinator.poll_interval == MAX_SCAN_INTERVAL
+
+    simulator.rooms[3].readings["indoor CO2"] = 900
+    await coordinator.async_refresh()
+    assert coordinator.poll_interval == SCAN_INTERVAL
+    assert coordinator.poll_reason == POLL_REASON_CHANGING
+
+    await coordinator.async_run_room_commands(
+        [1],
+        lambda room_id: coordinator.start_room_boost(
+            room_id=room_id, boost_level=150, boost_timeout=600
+        ),
+    )
+    assert coordinator.poll_reason == POLL_REASON_COMMAND
+
+    for _ in range(2):
+        await coordinator.async_refresh()
+    assert coordinator.poll_interval == SCAN_INTERVAL
+    assert coordinator.poll_reason == POLL_REASON_BOOST
+
+
+async def test_rooms_are_added_and_removed(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test a new room gets entities and a removed room loses its device."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+    entry = coordinator.config_entry
+    entity_registry = er.async_get(hass)
+    device_registry = dr.async_get(hass)
+
+    simulator.add_room(4)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}-4-4_temperature"
+    )
+    assert hass.states.get(entity_id).state == "21.5"
+    assert entity_registry.async_get_entity_id(
+        "binary_sensor", DOMAIN, f"{entry.entry_id}-4-4_boost_status"
+    )
+    topology = hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]["topology"]
+    assert topology["rooms"].keys() == {"1", "2", "3", "4"}
+
+    del simulator.rooms[2]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.changes.removed_rooms == {2}
+    assert (
+        device_registry.async_get_device(
+            identifiers={(DOMAIN, f"{entry.unique_id}_2")}
+        )
+        is None
+    )
+    assert (
+        entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{entry.entry_id}-2-2_temperature"
+        )
+        is None
+    )
+    assert 2 not in coordinator.telemetry.rooms
+    topology = hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]["topology"]
+    assert topology["rooms"].keys() == {"1", "3", "4"}
+
+
+async def test_firmware_change_reloads_the_entry(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test a new firmware version is stored and reloads the entry."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+    entry = coordinator.config_entry
+    key = f"{DOMAIN}.{entry.entry_id}"
+    assert hass_storage[key]["data"]["topology"]["firmware_version"] == "2.4.1"
+
+    simulator.firmware_version = "2.5.0"
+    coordinator._metadata_refreshed = None
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass_storage[key]["data"]["topology"]["firmware_version"] == "2.5.0"
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.data[DOMAIN][entry.entry_id] is not coordinator
+
+
+async def test_failures_trip_the_breaker_and_notify(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test every failed refresh signals the coordinator state."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+    notified: list[str] = []
+    async_dispatcher_connect(
+        hass, coordinator.state_signal, lambda: notified.append(coordinator.breaker.state)
+    )
+
+    simulator.status = 503
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert notified == [BREAKER_CLOSED] * (BREAKER_FAILURE_THRESHOLD - 1) + [
+        BREAKER_OPEN
+    ]
+    assert coordinator.poll_reason == POLL_REASON_ERROR
+    assert coordinator.stats.failure_count == BREAKER_FAILURE_THRESHOLD
+
+    simulator.status = None
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.breaker.state == BREAKER_CLOSED
+    assert notified[-1] == BREAKER_HALF_OPEN
+
+
+async def test_malformed_payload_fails_the_refresh(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test an undecodable payload fails the refresh and keeps polling."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+
+    simulator.malformed = True
+    await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert "Invalid current data" in coordinator.stats.last_error
+    assert coordinator._poll_handle is not None
+
+
+async def test_authentication_failure_starts_reauth(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test a rejected request starts reauthentication and stops polling."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+
+    simulator.failures[ENDPOINT_CURRENT_DATA] = 401
+    with patch(
+        "homeassistant.config_entries.ConfigEntry.async_start_reauth"
+    ) as start_reauth:
+        await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    assert coordinator._poll_handle is None
+    start_reauth.assert_called_once()
+
+
+async def test_disabled_polling_is_respected(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test no poll is scheduled while polling is disabled for the entry."""
+    entry = await setup_healthbox(simulator)
+    # Changing the system options reloads the entry.
+    hass.config_entries.async_update_entry(entry, pref_disable_polling=True)
+    await hass.async_block_till_done()
+    coordinator: HealthboxDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator._poll_handle is None
+
+
+async def test_unload_stops_polling(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test unloading the entry cancels the scheduled poll."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+    handle = coordinator._poll_handle
+
+    assert await hass.config_entries.async_unload(coordinator.config_entry.entry_id)
+
+    assert coordinator.config_entry.state is ConfigEntryState.NOT_LOADED
+    assert handle.cancelled()
+    assert coordinator._poll_handle is None
+
+
+async def test_concurrent_refreshes_share_one_fetch(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test concurrent refreshes fetch and fan out once."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+    requests = simulator.requests[ENDPOINT_CURRENT_DATA]
+    fan_outs = coordinator.stats.fan_out.count
+    simulator.latency = 0.05
+
+    await asyncio.gather(*(coordinator.async_refresh() for _ in range(3)))
+
+    assert simulator.requests[ENDPOINT_CURRENT_DATA] == requests + 1
+    assert coordinator.stats.fan_out.count == fan_outs + 1
+    assert coordinator._refresh_task is None
+
+
+async def test_requested_refreshes_are_debounced(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test a burst of requested refreshes leads to one poll after the cooldown."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+    coordinator._async_cancel_poll()
+    requests = simulator.requests[ENDPOINT_CURRENT_DATA]
+
+    for _ in range(3):
+        await coordinator.async_request_refresh()
+    await hass.async_block_till_done()
+    assert simulator.requests[ENDPOINT_CURRENT_DATA] == requests
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=COMMAND_REFRESH_COOLDOWN)
+    )
+    await hass.async_block_till_done()
+
+    assert simulator.requests[ENDPOINT_CURRENT_DATA] == requests + 1
+
+
+async def test_commands_apply_optimistically(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test a command updates the snapshot before the device is polled."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+
+    await coordinator.start_room_boost(room_id=1, boost_level=150, boost_timeout=600)
+
+    assert simulator.commands == [
+        ("/v2/api/boost/1", {"enable": True, "level": 150, "timeout": 600})
+    ]
+    assert coordinator.data.rooms[1].boost == HealthboxRoomBoost(
+        level=150, enabled=True, remaining=600
+    )
+    assert "boost" in coordinator.changes.rooms[1]
+
+    await coordinator.change_room_profile(room_id=2, profile_name="Eco")
+    assert simulator.rooms[2].profile_name == "eco"
+    assert coordinator.data.rooms[2].profile_name == "Eco"
+
+    await coordinator.async_refresh()
+    assert coordinator.data.rooms[1].boost.enabled
+    assert not coordinator._pending
+
+
+async def test_command_during_a_refresh_keeps_its_changes(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test a command applied before a refresh fans out does not drop its changes."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+    sync_topology = coordinator._async_sync_topology
+
+    async def _async_sync_topology_with_command(data: HealthboxDataObject) -> None:
+        await coordinator.change_room_profile(room_id=1, profile_name="Eco")
+        await sync_topology(data)
+
+    simulator.rooms[2].readings["indoor relative humidity"] = 71
+    with patch.object(
+        coordinator, "_async_sync_topology", _async_sync_topology_with_command
+    ):
+        await coordinator.async_refresh()
+
+    assert "profile_name" in coordinator.changes.rooms[1]
+    assert "indoor_humidity" in coordinator.changes.rooms[2]
+
+
+async def test_poll_before_the_command_keeps_the_command(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test a poll that started before a command finished does not roll it back."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+    fetch_started = monotonic()
+    await coordinator.change_room_profile(room_id=1, profile_name="Eco")
+    # The poll read the room before the command reached the device.
+    coordinator.data.rooms[1].profile_name = "Health"
+
+    coordinator._reconcile_optimistic(coordinator.data, fetch_started)
+
+    assert coordinator.data.rooms[1].profile_name == "Eco"
+    assert 1 in coordinator._pending
+
+
+async def test_rejected_command_rolls_back(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a later poll that contradicts a command rolls it back."""
+    coordinator = await _async_setup_coordinator(hass, simulator, setup_healthbox)
+    await coordinator.change_room_profile(room_id=1, profile_name="Eco")
+    # The device ignored the command.
+    simulator.rooms[1].profile_name = "health"
+
+    await coordinator.async_refresh()
+
+    assert coordinator.data.rooms[1].profile_name == "Health"
+    assert "profile_name" in coordinator.changes.rooms[1]
+    assert "instead of the commanded Eco" in caplog.text
+    assert not coordinator._pending
@@ -0,0 +1,142 @@
+"""Tests for the Renson Healthbox entity helpers."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.healthbox.const import (
+    CONF_EXTERNAL_STATISTICS,
+    CONF_TEMPERATURE_DEADBAND,
+    DOMAIN,
+)
+from custom_components.healthbox.entity import HealthboxEntity, value_changed
+
+from .conftest import SetupHealthbox
+from .simulator import HealthboxSimulator
+
+
+@pytest.mark.parametrize(
+    ("previous", "current", "deadband", "changed"),
+    [
+        (None, None, 0, False),
+        (None, 0, 0, True),
+        (0, None, 0, True),
+        (21.5, 21.5, 0, False),
+        (21.5, 21.6, 0, True),
+        (21.5, 21.6, 0.5, False),
+        (21.5, 22.0, 0.5, True),
+        (21.5, 21.0, 0.5, True),
+        ("Eco", "Eco", 1, False),
+        ("Eco", "Health", 1, True),
+        (False, True, 5, True),
+    ],
+)
+def test_value_changed(
+    previous: object, current: object, deadband: float, changed: bool
+) -> None:
+    """Test the deadband only applies to numbers."""
+    assert value_changed(previous, current, deadband) is changed
+
+
+def test_entities_implement_the_value_hooks() -> None:
+    """Test an entity without the value hooks cannot be created."""
+    with pytest.raises(TypeError, match="_compute_value"):
+        HealthboxEntity(None)
+
+
+def _get_sensor(hass: HomeAssistant, entry: ConfigEntry, key: str) -> HealthboxEntity:
+    """Return the sensor entity with the given description key."""
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}-{key}"
+    )
+    return hass.data["sensor"].get_entity(entity_id)
+
+
+async def test_only_entities_reading_a_changed_field_update(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test a refresh only recomputes the entities whose fields changed."""
+    entry = await setup_healthbox(simulator)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    def _entity(key: str) -> HealthboxEntity:
+        return _get_sensor(hass, entry, key)
+
+    simulator.rooms[2].readings["indoor relative humidity"] = 71
+    # Let the fan run for a minute so its energy moves.
+    freezer.tick(60)
+    await coordinator.async_refresh()
+
+    assert _entity("2-2_humidity")._is_affected()
+    assert _entity("2-2_humidity_rate")._is_affected()
+    # Only the derived values and the fan energy of the other rooms moved.
+    assert not _entity("2-2_temperature")._is_affected()
+    assert not _entity("1-1_humidity")._is_affected()
+    assert not _entity("fan_power")._is_affected()
+    assert _entity("fan_energy")._is_affected()
+
+
+async def test_deadband_from_the_options(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test a reading is only written once it moved by the configured deadband."""
+    entry = await setup_healthbox(simulator, options={CONF_TEMPERATURE_DEADBAND: 1})
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    entity_id = _get_sensor(hass, entry, "1-1_temperature").entity_id
+
+    simulator.rooms[1].readings["indoor temperature"] = 22.0
+    await coordinator.async_refresh()
+    assert hass.states.get(entity_id).state == "21.5"
+
+    simulator.rooms[1].readings["indoor temperature"] = 22.6
+    await coordinator.async_refresh()
+    assert hass.states.get(entity_id).state == "22.6"
+
+
+async def test_aggregated_sensor_writes_the_time_weighted_mean(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test an aggregated sensor adds one value per fetch and writes its mean."""
+    freezer.move_to("2026-01-01 00:00:10+00:00")
+    entry = await setup_healthbox(simulator, options={CONF_EXTERNAL_STATISTICS: True})
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    temperature = _get_sensor(hass, entry, "3-3_temperature")
+    window = temperature._aggregate
+
+    simulator.rooms[3].readings["indoor temperature"] = 20
+    await coordinator.async_refresh()
+    freezer.move_to("2026-01-01 00:01:10+00:00")
+    simulator.rooms[3].readings["indoor temperature"] = 30
+    await coordinator.async_refresh()
+    last = window._last
+
+    # Commands for another room do not add values to the window.
+    await coordinator.start_room_boost(room_id=1, boost_level=150, boost_timeout=600)
+    await coordinator.change_room_profile(room_id=1, profile_name="Eco")
+    assert window._last == last
+
+    with patch.object(coordinator.statistics, "add") as add_statistics:
+        freezer.move_to("2026-01-01 00:05:10+00:00")
+        await coordinator.async_refresh()
+
+    mean = round((60 * 20 + 230 * 30) / 290, 2)
+    assert hass.states.get(temperature.entity_id).state == str(mean)
+    aggregates = {
+        metadata["name"]: aggregate
+        for (metadata, aggregate), _ in add_statistics.call_args_list
+    }
+    assert aggregates["Room 3 Temperature"].duration == 290
@@ -0,0 +1,106 @@
+"""Tests for setting up the Renson Healthbox integration."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.healthbox.const import (
+    CONF_FAST_START,
+    DOMAIN,
+    ENDPOINT_CURRENT_DATA,
+)
+
+from .conftest import SetupHealthbox
+from .simulator import HealthboxSimulator
+
+
+async def test_setup_and_unload(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test the entities of every room are set up and the entry unloads."""
+    entry = await setup_healthbox(simulator)
+
+    assert entry.state is ConfigEntryState.LOADED
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert set(coordinator.data.rooms) == {1, 2, 3}
+    assert coordinator.data.firmware_version == "2.4.1"
+    assert coordinator.data.rooms[1].indoor_temperature == 21.5
+    entities = er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    assert entities
+    assert all(
+        hass.states.get(entity.entity_id) is not None
+        for entity in entities
+        if entity.disabled_by is None
+    )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert entry.state is ConfigEntryState.NOT_LOADED
+    assert DOMAIN not in hass.data
+
+
+async def test_reload_starts_from_the_stored_data(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test a reload sets up the entities from the stored data before going live."""
+    entry = await setup_healthbox(simulator)
+    simulator.failures[ENDPOINT_CURRENT_DATA] = 503
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    # Without the stored data the unreachable Healthbox would fail the setup.
+    assert entry.state is ConfigEntryState.LOADED
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert set(coordinator.data.rooms) == {1, 2, 3}
+    assert coordinator.data.rooms[1].indoor_temperature == 21.5
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}-1-1_temperature"
+    )
+    assert hass.states.get(entity_id) is not None
+
+    del simulator.failures[ENDPOINT_CURRENT_DATA]
+    simulator.rooms[1].readings["indoor temperature"] = 23
+    await coordinator.async_refresh()
+
+    assert hass.states.get(entity_id).state == "23"
+
+
+async def test_setup_without_stored_data_fetches_first(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test fast start falls back to the first refresh without stored data."""
+    simulator.failures[ENDPOINT_CURRENT_DATA] = 503
+
+    entry = await setup_healthbox(simulator, options={CONF_FAST_START: True})
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+
+
+async def test_rejected_api_key_during_fast_start_starts_reauth(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test a key rejected after a fast start asks for a new key."""
+    entry = await setup_healthbox(simulator, options={CONF_FAST_START: True})
+    simulator.failures["/v2/api/api_key/status"] = 401
+
+    with patch(
+        "homeassistant.config_entries.ConfigEntry.async_start_reauth"
+    ) as start_reauth:
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    start_reauth.assert_called_once()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.last_update_success
@@ -0,0 +1,47 @@
+"""Tests for the Renson Healthbox fleet scheduler."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.healthbox.const import SCAN_INTERVAL
+from custom_components.healthbox.scheduler import HealthboxFleetScheduler
+
+PERIOD = SCAN_INTERVAL.total_seconds()
+
+
+def test_phases_spread_over_the_interval() -> None:
+    """Test the entries get evenly spread offsets that move up on removal."""
+    scheduler = HealthboxFleetScheduler()
+    for entry_id in ("a", "b", "c", "d"):
+        scheduler.async_add(entry_id)
+    scheduler.async_add("a")
+
+    assert scheduler.size == 4
+    assert [scheduler.phase(entry_id) for entry_id in "abcd"] == [
+        pytest.approx(PERIOD * index / 4) for index in range(4)
+    ]
+    assert scheduler.phase("unknown") == 0
+
+    scheduler.async_remove("a")
+    assert scheduler.phase("b") == 0
+    assert scheduler.phase("d") == pytest.approx(PERIOD * 2 / 3)
+
+
+@pytest.mark.parametrize("earliest", [0, 1.3, 2.5, 4.99, 1000.7])
+def test_next_slot_is_the_first_in_the_slot(earliest: float) -> None:
+    """Test the next slot is not before earliest and within one period of it."""
+    scheduler = HealthboxFleetScheduler()
+    scheduler.async_add("a")
+    scheduler.async_add("b")
+
+    slot = scheduler.next_slot("b", earliest)
+
+    assert earliest <= slot < earliest + PERIOD
+    assert slot % PERIOD == pytest.approx(scheduler.phase("b"))
+
+
+def test_next_slot_on_the_slot() -> None:
+    """Test a time that falls in the slot is kept."""
+    scheduler = HealthboxFleetScheduler()
+    scheduler.async_add("a")
+    assert scheduler.next_slot("a", 3 * PERIOD) == 3 * PERIOD
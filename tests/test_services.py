@@ -0,0 +1,143 @@
+"""Tests for the Renson Healthbox services."""
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.setup import async_setup_component
+
+from custom_components.healthbox.const import (
+    DOMAIN,
+    SERVICE_CHANGE_ROOM_PROFILE,
+    SERVICE_DUMP_TELEMETRY,
+    SERVICE_START_ROOM_BOOST,
+    SERVICE_STOP_ROOM_BOOST,
+)
+
+from .conftest import SetupHealthbox
+from .simulator import HealthboxSimulator
+
+
+def _room_device_id(hass: HomeAssistant, unique_id: str, room_id: int) -> str:
+    """Return the device id of a Healthbox room."""
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, f"{unique_id}_{room_id}")}
+    )
+    assert device is not None
+    return device.id
+
+
+async def test_services_are_registered_without_entries(hass: HomeAssistant) -> None:
+    """Test the services exist before an entry is set up."""
+    assert await async_setup_component(hass, DOMAIN, {})
+
+    for service in (
+        SERVICE_CHANGE_ROOM_PROFILE,
+        SERVICE_DUMP_TELEMETRY,
+        SERVICE_START_ROOM_BOOST,
+        SERVICE_STOP_ROOM_BOOST,
+    ):
+        assert hass.services.has_service(DOMAIN, service)
+
+
+async def test_room_commands(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test the room services send one command per targeted room."""
+    entry = await setup_healthbox(simulator)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    device_ids = [_room_device_id(hass, entry.unique_id, room) for room in (1, 2)]
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_START_ROOM_BOOST,
+        {ATTR_DEVICE_ID: device_ids, "boost_level": 150, "boost_timeout": 10},
+        blocking=True,
+    )
+
+    assert sorted(simulator.commands) == [
+        ("/v2/api/boost/1", {"enable": True, "level": 150, "timeout": 600}),
+        ("/v2/api/boost/2", {"enable": True, "level": 150, "timeout": 600}),
+    ]
+    assert coordinator.data.rooms[1].boost.enabled
+    assert not coordinator.data.rooms[3].boost.enabled
+
+    simulator.commands.clear()
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_STOP_ROOM_BOOST,
+        {ATTR_DEVICE_ID: device_ids[0]},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CHANGE_ROOM_PROFILE,
+        {ATTR_DEVICE_ID: device_ids[1], "profile_name": "Intensive"},
+        blocking=True,
+    )
+
+    assert simulator.commands == [
+        ("/v2/api/boost/1", {"enable": False}),
+        ("/v2/api/data/current/room/2/profile_name", "intensive"),
+    ]
+    assert not coordinator.data.rooms[1].boost.enabled
+    assert coordinator.data.rooms[2].profile_name == "Intensive"
+
+
+async def test_room_command_without_loaded_target(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test a room service without a loaded Healthbox room fails validation."""
+    await setup_healthbox(simulator)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_STOP_ROOM_BOOST,
+            {ATTR_DEVICE_ID: "unknown"},
+            blocking=True,
+        )
+    assert not simulator.commands
+
+
+async def test_dump_telemetry(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test the recent readings of a room are returned."""
+    entry = await setup_healthbox(simulator)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    simulator.rooms[1].readings["indoor CO2"] = 700
+    await coordinator.async_refresh()
+    device_id = _room_device_id(hass, entry.unique_id, 1)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_DUMP_TELEMETRY,
+        {ATTR_DEVICE_ID: device_id, "metric": "co2", "samples": 1},
+        blocking=True,
+        return_response=True,
+    )
+
+    timestamp, _ = coordinator.telemetry.get(1, "co2").latest()
+    assert response == {
+        "devices": {device_id: {"co2": {"timestamps": [timestamp], "values": [700]}}}
+    }
+
+    # The VOC sensor is disabled by default, so its readings are not kept.
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_DUMP_TELEMETRY,
+            {ATTR_DEVICE_ID: device_id, "metric": "voc"},
+            blocking=True,
+            return_response=True,
+        )
@@ -0,0 +1,57 @@
+"""Tests for the Renson Healthbox session pool."""
+from __future__ import annotations
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant
+
+from custom_components.healthbox.const import DOMAIN
+from custom_components.healthbox.session import async_get_session_pool
+
+from .conftest import SetupHealthbox
+from .simulator import HealthboxSimulator
+
+
+async def test_sessions_are_shared_per_host(hass: HomeAssistant) -> None:
+    """Test a host session is shared until its last user releases it."""
+    pool = async_get_session_pool(hass)
+    assert async_get_session_pool(hass) is pool
+
+    session = pool.async_acquire("192.168.1.10")
+    assert pool.async_acquire("192.168.1.10") is session
+    other = pool.async_acquire("192.168.1.11")
+    assert other is not session
+
+    pool.async_release("192.168.1.10")
+    await hass.async_block_till_done()
+    assert not session.closed
+    pool.async_release("192.168.1.10")
+    await hass.async_block_till_done()
+    assert session.closed
+    # Releasing a host without users is ignored.
+    pool.async_release("192.168.1.10")
+
+    renewed = pool.async_acquire("192.168.1.10")
+    assert renewed is not session
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert renewed.closed
+    assert other.closed
+
+
+async def test_entries_release_their_session(
+    hass: HomeAssistant,
+    simulator: HealthboxSimulator,
+    setup_healthbox: SetupHealthbox,
+) -> None:
+    """Test the coordinator uses the pooled session until the entry unloads."""
+    entry = await setup_healthbox(simulator)
+    pool = async_get_session_pool(hass)
+    session = hass.data[DOMAIN][entry.entry_id].session
+    assert pool.async_acquire(simulator.host) is session
+    pool.async_release(simulator.host)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert session.closed
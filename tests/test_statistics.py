@@ -0,0 +1,122 @@
+"""Tests for the Renson Healthbox statistics aggregation."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.healthbox.const import DOMAIN
+from custom_components.healthbox.statistics import (
+    HealthboxAggregate,
+    HealthboxStatisticsImporter,
+    HealthboxStatisticsWindow,
+)
+
+
+def test_window_aggregates_until_the_next_window() -> None:
+    """Test values are weighted by how long they held per clock-aligned window."""
+    window = HealthboxStatisticsWindow(300)
+
+    assert window.add_value(610, 20) is None
+    assert window.add_value(700, 10) is None
+    assert window.add_value(899, 30) is None
+    finished = window.add_value(960, 5)
+
+    assert finished is not None
+    assert finished.start == 600
+    assert (finished.minimum, finished.maximum) == (10, 30)
+    assert finished.duration == 290
+    assert finished.mean == pytest.approx((90 * 20 + 199 * 10 + 1 * 30) / 290)
+    # The last value held into the next window until the new one was added.
+    assert window.current is not None
+    assert window.current.start == 900
+    assert (window.current.minimum, window.current.maximum) == (5, 30)
+    assert window.current.mean == 30
+
+
+def test_window_mean_does_not_depend_on_the_poll_rate() -> None:
+    """Test faster polls of the same value do not add weight to it."""
+    slow = HealthboxStatisticsWindow(300)
+    fast = HealthboxStatisticsWindow(300)
+
+    slow.add_value(0, 10)
+    slow.add_value(150, 20)
+    for timestamp in range(0, 150, 5):
+        fast.add_value(timestamp, 10)
+    for timestamp in range(150, 300, 1):
+        fast.add_value(timestamp, 20)
+
+    assert slow.advance(300).mean == fast.advance(300).mean == pytest.approx(15)
+    assert HealthboxStatisticsWindow(300).advance(300) is None
+
+
+def test_window_merges_aggregates() -> None:
+    """Test hourly windows merge the aggregates of shorter windows."""
+    hours = HealthboxStatisticsWindow(3600)
+
+    assert (
+        hours.add(
+            HealthboxAggregate(start=0, minimum=1, maximum=3, total=600, duration=300)
+        )
+        is None
+    )
+    assert (
+        hours.add(
+            HealthboxAggregate(start=300, minimum=0, maximum=2, total=100, duration=100)
+        )
+        is None
+    )
+    finished = hours.add(
+        HealthboxAggregate(start=3600, minimum=9, maximum=9, total=2700, duration=300)
+    )
+
+    assert finished == HealthboxAggregate(
+        start=0, minimum=0, maximum=3, total=700, duration=400
+    )
+    assert finished.mean == 1.75
+
+
+async def test_importer_imports_finished_hours(hass: HomeAssistant) -> None:
+    """Test the aggregates are merged per hour and imported once the hour ended."""
+    importer = HealthboxStatisticsImporter(hass)
+    metadata = StatisticMetaData(
+        has_mean=True,
+        has_sum=False,
+        name="Room 1 Temperature",
+        source=DOMAIN,
+        statistic_id=f"{DOMAIN}:room_1_temperature",
+        unit_of_measurement="°C",
+    )
+    importer.add(
+        metadata,
+        HealthboxAggregate(start=0, minimum=20, maximum=21, total=6000, duration=300),
+    )
+    importer.add(
+        metadata,
+        HealthboxAggregate(start=300, minimum=22, maximum=22, total=6600, duration=300),
+    )
+    importer.add(
+        metadata,
+        HealthboxAggregate(start=3600, minimum=19, maximum=19, total=5700, duration=300),
+    )
+    hass.config.components.add("recorder")
+
+    with patch(
+        "custom_components.healthbox.statistics.async_add_external_statistics"
+    ) as add_statistics:
+        importer.async_flush()
+        importer.async_flush()
+
+    add_statistics.assert_called_once_with(
+        hass,
+        metadata,
+        [
+            StatisticData(
+                start=dt_util.utc_from_timestamp(0), mean=21, min=20, max=22
+            )
+        ],
+    )
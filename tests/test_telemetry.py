@@ -0,0 +1,186 @@
+"""Tests for the Renson Healthbox telemetry."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.healthbox.const import (
+    PROJECTION_FAN,
+    HealthboxChangeSet,
+    HealthboxDataObject,
+    HealthboxFan,
+    HealthboxRoom,
+)
+from custom_components.healthbox.telemetry import (
+    HealthboxDerivedCalculator,
+    HealthboxRateOfChange,
+    HealthboxRingBuffer,
+    HealthboxTelemetry,
+    is_metric_recorded,
+)
+
+
+def test_ring_buffer_overwrites_the_oldest_samples() -> None:
+    """Test a full buffer keeps the newest samples in order."""
+    buffer = HealthboxRingBuffer(capacity=3)
+    assert buffer.latest() is None
+    assert buffer.time_weighted_mean(60) is None
+
+    for timestamp in range(5):
+        buffer.append(timestamp, timestamp * 10)
+
+    assert len(buffer) == 3
+    assert buffer.latest() == (4, 40)
+    assert buffer.as_dict() == {"timestamps": [2, 3, 4], "values": [20, 30, 40]}
+    assert buffer.as_dict(samples=1) == {"timestamps": [4], "values": [40]}
+
+
+def test_ring_buffer_samples_since() -> None:
+    """Test counting the samples from a timestamp on."""
+    buffer = HealthboxRingBuffer(capacity=4)
+    for timestamp in (0, 10, 20, 30, 40, 50):
+        buffer.append(timestamp, 1)
+
+    assert buffer.samples_since(0) == 4
+    assert buffer.samples_since(30) == 3
+    assert buffer.samples_since(31) == 2
+    assert buffer.samples_since(51) == 0
+
+
+def test_time_weighted_mean_weighs_by_duration() -> None:
+    """Test fast polls while a value changes do not outweigh slow ones."""
+    buffer = HealthboxRingBuffer()
+    # 0 for 50 seconds, then 20 for 50 seconds polled every 5 seconds.
+    buffer.append(0, 0)
+    for timestamp in range(50, 101, 5):
+        buffer.append(timestamp, 20)
+
+    assert buffer.time_weighted_mean(100) == pytest.approx(10)
+    # The value before the window holds into it.
+    assert buffer.time_weighted_mean(25) == pytest.approx(20)
+    assert buffer.time_weighted_mean(60) == pytest.approx(50 * 20 / 60)
+
+
+def test_time_weighted_mean_covers_what_the_buffer_holds() -> None:
+    """Test a window longer than the buffer covers the held samples."""
+    buffer = HealthboxRingBuffer(capacity=3)
+    for timestamp, value in ((0, 100), (10, 0), (20, 0), (30, 10)):
+        buffer.append(timestamp, value)
+
+    # The overwritten sample of 100 no longer counts.
+    assert buffer.time_weighted_mean(3600) == pytest.approx(0)
+    buffer.append(40, 10)
+    # 0 from 20 to 30 and 10 from 30 to 40.
+    assert buffer.time_weighted_mean(3600) == pytest.approx(5)
+
+
+def test_time_weighted_mean_of_a_single_sample() -> None:
+    """Test the mean of a single sample is its value."""
+    buffer = HealthboxRingBuffer()
+    buffer.append(100, 7)
+    assert buffer.time_weighted_mean(300) == 7
+
+
+def test_time_weighted_mean_keeps_the_window_start() -> None:
+    """Test the kept window starts match a search over the held samples."""
+    buffer = HealthboxRingBuffer(capacity=50)
+    for timestamp in range(0, 2000, 7):
+        buffer.append(timestamp, timestamp % 13)
+        for seconds in (60, 300):
+            buffer.time_weighted_mean(seconds)
+            assert buffer._starts[seconds] == buffer.count - buffer.samples_since(
+                timestamp - seconds
+            )
+
+
+def test_rate_of_change_per_minute() -> None:
+    """Test the first rate is exact and later rates are smoothed."""
+    rate = HealthboxRateOfChange()
+    assert rate.add(0, 400) is None
+    assert rate.add(60, 460) == pytest.approx(60)
+    assert 0 < rate.add(120, 460) < 60
+    # Samples without elapsed time keep the rate.
+    assert rate.add(120, 1000) == rate.rate
+
+
+def _snapshot(co2: float | None = 600, power: float | None = 20) -> HealthboxDataObject:
+    """Return a snapshot with one room and the fan."""
+    return HealthboxDataObject(
+        serial="1",
+        description="Healthbox 3.0",
+        warranty_number="W1",
+        fan=HealthboxFan(power=power, flow=100),
+        rooms={
+            1: HealthboxRoom(
+                room_id=1,
+                name="Living",
+                room_type="LivingRoom",
+                indoor_co2_concentration=co2,
+                indoor_humidity=50,
+                indoor_voc_ppm=200,
+            )
+        },
+    )
+
+
+def test_is_metric_recorded() -> None:
+    """Test which metrics a projection records."""
+    assert is_metric_recorded(None, "voc")
+    assert is_metric_recorded(None, "fan_power")
+    projection = frozenset({"indoor CO2"})
+    assert is_metric_recorded(projection, "co2")
+    assert not is_metric_recorded(projection, "voc")
+    assert not is_metric_recorded(projection, "fan_power")
+    assert is_metric_recorded(projection | {PROJECTION_FAN}, "fan_power")
+    # The ventilation rate is always read.
+    assert is_metric_recorded(projection, "ventilation_rate")
+
+
+def test_telemetry_records_the_projected_readings() -> None:
+    """Test only the readings of a refresh are recorded."""
+    telemetry = HealthboxTelemetry()
+    telemetry.record(_snapshot(), 0, frozenset({"indoor CO2"}))
+
+    assert telemetry.dump(1) == {
+        "co2": {"timestamps": [0], "values": [600]},
+    }
+    assert telemetry.dump(None) == {}
+
+    telemetry.record(_snapshot(co2=None), 5)
+    assert set(telemetry.dump(1)) == {"co2", "humidity", "voc"}
+    assert telemetry.dump(1, "co2")["co2"]["values"] == [600]
+    assert set(telemetry.dump(None)) == {"fan_power", "fan_flow"}
+
+    telemetry.remove_room(1)
+    assert telemetry.dump(1) == {}
+
+
+def test_derived_values_follow_the_telemetry() -> None:
+    """Test the derived room values and the fan energy."""
+    telemetry = HealthboxTelemetry()
+    derived = HealthboxDerivedCalculator(telemetry)
+    for timestamp, co2 in ((0, 600), (60, 660)):
+        data = _snapshot(co2=co2, power=3600)
+        telemetry.record(data, timestamp)
+        changes = HealthboxChangeSet()
+        derived.update(data, timestamp, changes)
+
+    room = data.rooms[1]
+    assert changes.rooms == {1: {"derived"}}
+    assert room.derived["co2_rate"] == 60
+    assert room.derived["co2_mean_5m"] == 600
+    assert room.derived["humidity_mean_60m"] == 50
+    # 3600 W for one minute.
+    assert data.fan_energy == pytest.approx(0.06)
+    assert "fan_energy" in changes.fields
+
+
+def test_derived_energy_skips_unread_fan() -> None:
+    """Test the fan energy does not integrate over refreshes without the fan."""
+    telemetry = HealthboxTelemetry()
+    derived = HealthboxDerivedCalculator(telemetry)
+    data = _snapshot(power=3600)
+    derived.update(data, 0, HealthboxChangeSet())
+    derived.update(data, 60, HealthboxChangeSet(), frozenset({"indoor CO2"}))
+    derived.update(data, 120, HealthboxChangeSet())
+
+    assert data.fan_energy == 0